@@ -0,0 +1,66 @@
+"""
+Measure the cost of routing keyboard and mouse events through App, in
+batches over a long run, with a handler for one key and a handler for every
+key. The cost per event should stay flat however many events have been
+routed. Run from the repository root:
+
+    python benchmarks/keydispatch.py
+"""
+
+import io
+import os
+import sys
+import timeit
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position,protected-access
+from ggame.app import App
+from ggame.event import KeyEvent, MouseEvent
+
+BATCH = 20000
+BATCHES = 5
+
+
+class Hardware:
+    """Stand-in for a browser key or mouse event."""
+
+    def __init__(self, etype, code=0):
+        self.type = etype
+        self.keyCode = code
+        self.clientX = 10
+        self.clientY = 20
+        self.deltaY = 0
+
+
+def main():
+    """Print the time per routed event for successive batches of events."""
+    calls = [0]
+
+    def handler(_event):
+        calls[0] += 1
+
+    with redirect_stdout(io.StringIO()):
+        app = App(100, 100)
+    app.listenKeyEvent(KeyEvent.keydown, "space", handler)
+    app.listenKeyEvent(KeyEvent.keydown, "*", handler)
+    app.listenMouseEvent(MouseEvent.mousemove, handler)
+    space = Hardware("keydown", 32)
+    move = Hardware("mousemove")
+    print(f"{'events':>8} {'key us':>8} {'mouse us':>9} {'calls':>6}")
+    for batch in range(1, BATCHES + 1):
+        calls[0] = 0
+        key = timeit.timeit(lambda: app._keyEvent(space), number=BATCH) / BATCH
+        keycalls = calls[0] / BATCH
+        mouse = timeit.timeit(lambda: app._mouseEvent(move), number=BATCH) / BATCH
+        print(
+            f"{batch * BATCH:>8} {key * 1e6:>8.2f} {mouse * 1e6:>9.2f} "
+            f"{keycalls:>6.1f}"
+        )
+    with redirect_stdout(io.StringIO()):
+        app.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Compare hit testing mouse clicks against every movable MathApp point with hit
+testing through the MathApp quadtree index, as the number of points grows.
+Run from the repository root:
+
+    python benchmarks/mathhit.py
+"""
+
+import io
+import os
+import sys
+import random
+import timeit
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from ggame.mathapp import MathApp
+from ggame.point import Point
+
+CLICKS = 200
+
+
+class Click:
+    """Stand-in for a mouse event at a physical position."""
+
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+
+
+def linear(app, clicks):
+    """Seconds per click, testing every movable object in turn."""
+
+    def run():
+        for click in clicks:
+            for obj in app._mathMovableList:  # pylint: disable=protected-access
+                if obj.physicalPointTouching((click.x, click.y)):
+                    break
+
+    return timeit.timeit(run, number=1) / len(clicks)
+
+
+def indexed(app, clicks):
+    """Seconds per click, using the same mouse down handler as MathApp."""
+
+    def run():
+        for click in clicks:
+            app._handleMouseDown(click)  # pylint: disable=protected-access
+            app._handleMouseUp(click)  # pylint: disable=protected-access
+
+    return timeit.timeit(run, number=1) / len(clicks)
+
+
+def main():
+    """Print per-click timings for linear and indexed hit tests."""
+    print(f"{'points':>8} {'linear us':>12} {'indexed us':>12} {'speedup':>8}")
+    for count in (100, 1000, 5000):
+        rng = random.Random(count)
+        with redirect_stdout(io.StringIO()):
+            points = [
+                Point((rng.uniform(-2, 2), rng.uniform(-2, 2))) for _ in range(count)
+            ]
+            for p in points:
+                p.movable = True
+            app = MathApp()
+        clicks = [
+            Click(rng.uniform(0, 800), rng.uniform(0, 800)) for _ in range(CLICKS)
+        ]
+        slow = linear(app, clicks)
+        fast = indexed(app, clicks)
+        print(f"{count:>8} {slow * 1e6:>12.1f} {fast * 1e6:>12.1f} {slow / fast:>8.1f}")
+        with redirect_stdout(io.StringIO()):
+            for p in points:
+                p.destroy()
+            app.destroy()
+
+
+if __name__ == "__main__":
+    main()
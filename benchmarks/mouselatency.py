@@ -0,0 +1,88 @@
+"""
+Measure the latency of routing mouse move events through App, from the
+hardware event to the return of the last handler, and count how often the
+canvas is measured. Events are sent in bursts of 100 per animation frame,
+as when dragging, and compared with measuring the canvas for every event.
+Run from the repository root:
+
+    python benchmarks/mouselatency.py
+"""
+
+import io
+import os
+import sys
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position,protected-access
+from ggame.app import App
+from ggame.event import MouseEvent
+
+FRAMES = 200
+EVENTS = 100
+
+
+class Hardware:
+    """Stand-in for a browser mouse event."""
+
+    def __init__(self, x, y):
+        self.type = MouseEvent.mousemove
+        self.clientX = x
+        self.clientY = y
+        self.deltaY = 0
+
+
+class View:
+    """Canvas stand-in that counts how often it is measured."""
+
+    left = top = 0
+    width = height = 100
+
+    def __init__(self):
+        self.measured = 0
+
+    def getBoundingClientRect(self):
+        """Return the canvas rectangle, as the DOM would."""
+        self.measured += 1
+        return self
+
+
+def latencies(app, view, perevent):
+    """Per-event dispatch times in seconds, and canvas measurements per frame."""
+    times = []
+    view.measured = 0
+    for frame in range(FRAMES):
+        app.win.animate(lambda _dummy: None)
+        for i in range(EVENTS):
+            hwevent = Hardware(frame % 100, i)
+            if perevent:
+                app.win._geometry = None
+            start = time.perf_counter()
+            app._mouseEvent(hwevent)
+            times.append(time.perf_counter() - start)
+    times.sort()
+    return times, view.measured / FRAMES
+
+
+def main():
+    """Print mean and 99th percentile latency per mouse move event."""
+    with redirect_stdout(io.StringIO()):
+        app = App(100, 100)
+    view = View()
+    app.win.renderer.view = view
+    app.listenMouseEvent(MouseEvent.mousemove, lambda event: None)
+    print(f"{'canvas':>10} {'mean us':>8} {'p99 us':>8} {'measures/frame':>15}")
+    for label, perevent in (("per event", True), ("per frame", False)):
+        with redirect_stdout(io.StringIO()):
+            times, measured = latencies(app, view, perevent)
+        mean = sum(times) / len(times)
+        p99 = times[len(times) * 99 // 100]
+        print(f"{label:>10} {mean * 1e6:>8.2f} {p99 * 1e6:>8.2f} {measured:>15.1f}")
+    with redirect_stdout(io.StringIO()):
+        app.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Time a frame in which every sprite asks which sprites it is colliding with,
+using the default linear search and the spatial hash, when collision results
+are remembered for the frame and when they are thrown away after every
+query. Run from the repository root:
+
+    python benchmarks/paircache.py
+
+Apart from public methods the script only replaces App._pairresults, which
+earlier versions of ggame ignore, so it may be copied into an older tree to
+compare the default linear path before and after the cache was added.
+"""
+
+import os
+import sys
+import random
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position,protected-access
+from ggame.app import App
+from ggame.asset import PolygonAsset
+from ggame.sprite import Sprite
+
+FRAMES = 3
+
+
+def frametime(sprites, cached):
+    """Seconds per frame for every sprite to find its collisions."""
+
+    def frame():
+        # a new frame starts with an empty cache
+        App._pairresults = {}
+        for s in sprites:
+            s.collidingWithSprites()
+            if not cached:
+                App._pairresults = {}
+
+    return min(timeit.repeat(frame, number=1, repeat=FRAMES))
+
+
+def main():
+    """Print per-frame timings with and without the pair cache."""
+    asset = PolygonAsset([(0, 0), (20, 4), (24, 20), (6, 24), (0, 0)])
+    print(
+        f"{'broad phase':>12} {'sprites':>8} {'uncached ms':>12} {'cached ms':>10} "
+        f"{'speedup':>8}"
+    )
+    for hashed, counts in ((False, (500, 2000)), (True, (500, 2000, 4000))):
+        if hashed:
+            App.enableSpatialHash(32)
+        for count in counts:
+            rng = random.Random(count)
+            side = int((count * 16 * 16) ** 0.5)
+            sprites = [
+                Sprite(asset, (rng.uniform(0, side), rng.uniform(0, side)))
+                for _ in range(count)
+            ]
+            for s in sprites:
+                s.rotation = rng.uniform(0, 6)
+            slow = frametime(sprites, False)
+            fast = frametime(sprites, True)
+            print(
+                f"{'hash' if hashed else 'linear':>12} {count:>8} "
+                f"{slow * 1e3:>12.2f} {fast * 1e3:>10.2f} {slow / fast:>8.1f}"
+            )
+            for s in sprites:
+                s.destroy()
+    App.disableSpatialHash()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""
+Compare raycasts that test every sprite with raycasts that walk the spatial
+hash grid, as the number of sprites grows. Run from the repository root:
+
+    python benchmarks/raycast.py
+"""
+
+import os
+import sys
+import math
+import random
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from ggame.app import App
+from ggame.asset import RectangleAsset
+from ggame.sprite import Sprite
+
+RAYS = 200
+LENGTH = 300
+
+
+def populate(count, asset):
+    """Scatter sprites over an area that keeps the density constant."""
+    side = int((count * 40 * 40) ** 0.5)
+    rng = random.Random(count)
+    sprites = [
+        Sprite(asset, (rng.uniform(0, side), rng.uniform(0, side)))
+        for _ in range(count)
+    ]
+    angles = [rng.uniform(0, 2 * math.pi) for _ in range(RAYS)]
+    rays = [(s.position, (math.cos(a), math.sin(a))) for s, a in zip(sprites, angles)]
+    return sprites, rays
+
+
+def raytime(rays):
+    """Seconds per raycast, averaged over RAYS calls."""
+
+    def run():
+        for origin, direction in rays:
+            App.raycast(origin, direction, LENGTH)
+
+    return timeit.timeit(run, number=1) / len(rays)
+
+
+def main():
+    """Print per-ray timings for linear and hashed queries."""
+    asset = RectangleAsset(10, 10)
+    print(f"{'sprites':>8} {'linear us':>12} {'hashed us':>12} {'speedup':>8}")
+    for count in (100, 1000, 10000):
+        sprites, rays = populate(count, asset)
+        linear = raytime(rays)
+        App.enableSpatialHash(32)
+        hashed = raytime(rays)
+        App.disableSpatialHash()
+        print(
+            f"{count:>8} {linear * 1e6:>12.1f} {hashed * 1e6:>12.1f} "
+            f"{linear / hashed:>8.1f}"
+        )
+        for s in sprites:
+            s.destroy()
+
+
+if __name__ == "__main__":
+    main()
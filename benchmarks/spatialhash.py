@@ -0,0 +1,63 @@
+"""
+Compare linear and spatial hash collision queries as the number of sprites
+grows. Run from the repository root:
+
+    python benchmarks/spatialhash.py
+"""
+
+import os
+import sys
+import random
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from ggame.app import App
+from ggame.asset import RectangleAsset
+from ggame.sprite import Sprite
+
+QUERIES = 200
+
+
+def populate(count, asset):
+    """Scatter sprites over an area that keeps the density constant."""
+    side = int((count * 40 * 40) ** 0.5)
+    rng = random.Random(count)
+    return [
+        Sprite(asset, (rng.uniform(0, side), rng.uniform(0, side)))
+        for _ in range(count)
+    ]
+
+
+def querytime(sprites):
+    """Seconds per collidingWithSprites call, averaged over QUERIES calls."""
+    sample = sprites[:QUERIES]
+
+    def run():
+        for s in sample:
+            s.collidingWithSprites()
+
+    return timeit.timeit(run, number=1) / len(sample)
+
+
+def main():
+    """Print per-query timings for linear and hashed broad phase."""
+    asset = RectangleAsset(10, 10)
+    print(f"{'sprites':>8} {'linear us':>12} {'hashed us':>12} {'speedup':>8}")
+    for count in (100, 1000, 10000):
+        sprites = populate(count, asset)
+        linear = querytime(sprites)
+        App.enableSpatialHash(32)
+        hashed = querytime(sprites)
+        App.disableSpatialHash()
+        print(
+            f"{count:>8} {linear * 1e6:>12.1f} {hashed * 1e6:>12.1f} "
+            f"{linear / hashed:>8.1f}"
+        )
+        for s in sprites:
+            s.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Compare moving a swarm of sprites one at a time with moving the same swarm
+through a SpriteArray (requires numpy). Run from the repository root:
+
+    python benchmarks/spritearray.py
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+import numpy as np
+from ggame.app import App
+from ggame.asset import RectangleAsset
+from ggame.sprite import Sprite
+from ggame.spritearray import SpriteArray
+
+FRAMES = 10
+
+
+def main():
+    """Print the time per frame to move every sprite and update its extents."""
+    asset = RectangleAsset(4, 4)
+    app = App(640, 480)
+    print(f"{'sprites':>8} {'sprite ms':>10} {'array ms':>10}")
+    for count in (1000, 5000, 20000):
+        positions = [(i % 640, i // 640) for i in range(count)]
+        vx = np.linspace(-1, 1, count)
+        sprites = [Sprite(asset, pos) for pos in positions]
+        speeds = vx.tolist()
+
+        def spriteframe():
+            for s, v in zip(sprites, speeds):
+                s.x += v
+                s.rotation += 0.01
+                s.setExtents()
+
+        arr = SpriteArray(asset, positions)
+
+        def arrayframe():
+            arr.x += vx
+            arr.rotation += 0.01
+            arr.sync()
+
+        single = timeit.timeit(spriteframe, number=FRAMES) / FRAMES
+        bulk = timeit.timeit(arrayframe, number=FRAMES) / FRAMES
+        print(f"{count:>8} {single * 1e3:>10.2f} {bulk * 1e3:>10.2f}")
+        for s in sprites:
+            s.destroy()
+        arr.destroy()
+    app.destroy()
+
+
+if __name__ == "__main__":
+    main()
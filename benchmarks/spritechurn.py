@@ -0,0 +1,50 @@
+"""
+Measure the cost of creating and destroying sprites in a large, steady
+population, as happens with projectiles and particles. Run from the
+repository root:
+
+    python benchmarks/spritechurn.py
+"""
+
+import os
+import sys
+import random
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from ggame.app import App
+from ggame.asset import RectangleAsset
+from ggame.sprite import Sprite
+
+CHURN = 300
+FRAMES = 10
+
+
+def main():
+    """Print the time per frame to replace CHURN sprites at several sizes."""
+    asset = RectangleAsset(4, 4)
+    app = App(640, 480)
+    print(f"{'sprites':>8} {'ms/frame':>10} {'us/sprite':>10}")
+    for count in (1000, 5000, 20000):
+        sprites = [Sprite(asset, (i % 640, i // 640)) for i in range(count)]
+        rng = random.Random(count)
+
+        def frame():
+            # projectiles die in no particular order
+            rng.shuffle(sprites)
+            for s in sprites[-CHURN:]:
+                s.destroy()
+            del sprites[-CHURN:]
+            sprites.extend(Sprite(asset, (0, 0)) for i in range(CHURN))
+
+        elapsed = timeit.timeit(frame, number=FRAMES) / FRAMES
+        print(f"{count:>8} {elapsed * 1e3:>10.2f} {elapsed / CHURN / 2 * 1e6:>10.2f}")
+        for s in sprites:
+            s.destroy()
+    app.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Report the memory used per sprite, as measured by tracemalloc, for Sprite
+and for a copy of Sprite that keeps its attributes in an instance dict
+rather than in slots. Run from the repository root:
+
+    python benchmarks/spritememory.py
+"""
+
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from ggame.asset import RectangleAsset
+from ggame.sprite import Sprite
+
+COUNT = 100000
+
+# Sprite with its slot descriptors (and __slots__ itself) left out, so that
+# every attribute lives in the instance dict
+DictSprite = type(
+    "DictSprite",
+    Sprite.__bases__,
+    {
+        name: value
+        for name, value in vars(Sprite).items()
+        if name not in Sprite.__slots__ and name != "__slots__"
+    },
+)
+
+
+def used(sclass, asset):
+    """Average bytes allocated per sprite for COUNT sprites of sclass."""
+    # warm up caches shared by every sprite
+    sclass(asset).destroy()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    sprites = [sclass(asset, (i % 640, i // 640)) for i in range(COUNT)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    for s in sprites:
+        s.destroy()
+    return total / COUNT
+
+
+def main():
+    """Print the average allocation per sprite with and without slots."""
+    asset = RectangleAsset(4, 4)
+    print(f"{COUNT} sprites, bytes per sprite:")
+    print(f"{'instance dict':>14} {used(DictSprite, asset):>6.0f}")
+    print(f"{'slots':>14} {used(Sprite, asset):>6.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""
+Compare finding collisions between a few moving sprites and many walls when
+the walls are ordinary sprites and when they are static sprites. Run from the
+repository root:
+
+    python benchmarks/statictree.py
+"""
+
+import os
+import sys
+import random
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# pylint: disable=wrong-import-position
+from ggame.app import App
+from ggame.asset import RectangleAsset
+from ggame.sprite import Sprite
+
+MOVERS = 100
+FRAMES = 10
+
+
+def frametime(movers, rng):
+    """Seconds per frame to move every mover and find all collision pairs."""
+
+    def frame():
+        for s in movers:
+            s.x += rng.uniform(-2, 2)
+            s.y += rng.uniform(-2, 2)
+        App.collisionPairs()
+
+    return timeit.timeit(frame, number=FRAMES) / FRAMES
+
+
+def main():
+    """Print per-frame timings with dynamic and static walls."""
+    asset = RectangleAsset(16, 16)
+    print(
+        f"{'walls':>8} {'build ms':>10} {'dynamic ms':>12} {'static ms':>12} "
+        f"{'speedup':>8}"
+    )
+    for count in (1000, 5000, 20000):
+        rng = random.Random(count)
+        side = int((count * 32 * 32) ** 0.5)
+        walls = [
+            Sprite(asset, (rng.uniform(0, side), rng.uniform(0, side)))
+            for _ in range(count)
+        ]
+        movers = [
+            Sprite(asset, (rng.uniform(0, side), rng.uniform(0, side)))
+            for _ in range(MOVERS)
+        ]
+        dynamic = frametime(movers, rng)
+        for wall in walls:
+            wall.static = True
+        # the first frame builds the static tree
+        build = timeit.timeit(App.collisionPairs, number=1)
+        static = frametime(movers, rng)
+        print(
+            f"{count:>8} {build * 1e3:>10.2f} {dynamic * 1e3:>12.2f} "
+            f"{static * 1e3:>12.2f} {dynamic / static:>8.1f}"
+        )
+        for s in walls + movers:
+            s.destroy()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,9 +3,9 @@ ggame package defines names that may be imported directly from ggame (legacy)
 """
 from .__version__ import VERSION
 from .asset import ImageAsset, TextAsset, CircleAsset, RectangleAsset
-from .asset import PolygonAsset, LineAsset, EllipseAsset
+from .asset import PolygonAsset, LineAsset, EllipseAsset, CircleGroupAsset
 from .asset import Frame, Color, LineStyle, BLACK, WHITE, BLACKLINE, WHITELINE
 from .sound import SoundAsset, Sound
-from .sprite import Sprite
+from .sprite import Sprite, SpritePool
 from .app import App
-from .event import KeyEvent, MouseEvent
+from .event import KeyEvent, MouseEvent, CollisionEvent
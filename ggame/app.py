@@ -8,9 +8,72 @@ user Python code, and managing graphics elements (instances of
 
 # app.py
 
+import math
 import traceback
 from ggame.sysdeps import GFX_Window
-from ggame.event import MouseEvent, KeyEvent
+from ggame.event import MouseEvent, KeyEvent, CollisionEvent
+from ggame.spatial import SpatialHash, SweepAndPrune, AABBTree
+
+
+class _SpriteList:
+    """
+    An insertion-ordered collection of sprites with constant time append,
+    remove and membership tests. It supports the read-only parts of the list
+    interface (iteration, indexing, slicing and `len`). Iteration works on a
+    snapshot, so sprites may be added or destroyed while iterating.
+    """
+
+    def __init__(self, items=()):
+        self._items = dict.fromkeys(items)
+        self._snapshot = None
+
+    def _view(self):
+        if self._snapshot is None:
+            self._snapshot = tuple(self._items)
+        return self._snapshot
+
+    def append(self, obj):
+        """
+        Add a sprite to the end of the collection.
+        """
+        self._items[obj] = None
+        self._snapshot = None
+
+    def remove(self, obj):
+        """
+        Remove a sprite from the collection. Raises `ValueError` if the sprite
+        is not present.
+        """
+        try:
+            del self._items[obj]
+        except KeyError as err:
+            raise ValueError("sprite not in list") from err
+        self._snapshot = None
+
+    def __contains__(self, obj):
+        return obj in self._items
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self):
+        return iter(self._view())
+
+    def __getitem__(self, key):
+        if isinstance(key, slice):
+            return list(self._view()[key])
+        return self._view()[key]
+
+    def __eq__(self, other):
+        try:
+            return list(self) == list(other)
+        except TypeError:
+            return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self):
+        return repr(list(self))
 
 
 class App:
@@ -46,13 +109,32 @@ class App:
     instantiated at a time.
     """
 
-    spritelist = []
+    spritelist = _SpriteList()
     """
-    List of all sprites currently active in the application.
+    List of all sprites currently active in the application. This supports
+    iteration, indexing, slicing and `len`, with constant time membership
+    tests. Sprites may be destroyed while iterating over the list.
     """
     _eventdict = {}
+    _dispatch = None
     _spritesdict = {}
+    _spritesviews = {}
+    _spritesclasses = {}
     _spritesadded = False
+    _reaplist = {}
+    _parked = {}
+    _continuous = {}
+    _layers = {}
+    _layerviews = {}
+    _contacts = {}
+    _contacthandlers = {}
+    _stayhandlers = 0
+    _collisionclasses = {}
+    _spatialhash = None
+    _sweepandprune = None
+    _static = {}
+    _statictree = None
+    _pairresults = {}
     win = None
 
     def __init__(self, *args):
@@ -65,10 +147,12 @@ class App:
             App.width = App.win.width
             App.height = App.win.height
             # Add existing sprites to the window
-            if not App._spritesadded and App.spritelist:
+            if not App._spritesadded and (App.spritelist or App._parked):
                 App._spritesadded = True
                 for sprite in App.spritelist:
                     App.win.add(sprite.gfx)
+                for sprite in App._parked:
+                    App.win.add(sprite.gfx)
             App.win.bind(KeyEvent.keydown, type(self)._keyEvent)
             App.win.bind(KeyEvent.keyup, type(self)._keyEvent)
             App.win.bind(KeyEvent.keypress, type(self)._keyEvent)
@@ -90,12 +174,26 @@ class App:
                     traceback.print_exc()
                     raise
 
+    @classmethod
+    def _dispatchTable(cls):
+        # handler tuples for each event, rebuilt only when listeners change
+        if App._dispatch is None:
+            table = {k: tuple(v) for k, v in App._eventdict.items()}
+            for k in table:
+                if isinstance(k, tuple) and k[1] != "*":
+                    # events for each key also go to the handlers for "*"
+                    table[k] += tuple(App._eventdict.get((k[0], "*"), ()))
+            App._dispatch = table
+        return App._dispatch
+
     @classmethod
     def _keyEvent(cls, hwevent):
-        evtlist = App._eventdict.get(
-            (hwevent.type, KeyEvent.keys.get(hwevent.keyCode, 0)), []
-        )
-        evtlist.extend(App._eventdict.get((hwevent.type, "*"), []))
+        table = App._dispatch
+        if table is None:
+            table = cls._dispatchTable()
+        evtlist = table.get((hwevent.type, KeyEvent.keys.get(hwevent.keyCode, 0)))
+        if evtlist is None:
+            evtlist = table.get((hwevent.type, "*"))
         if evtlist:
             evt = KeyEvent(hwevent)
             cls._routeEvent(evt, evtlist)
@@ -103,7 +201,10 @@ class App:
 
     @classmethod
     def _mouseEvent(cls, hwevent):
-        evtlist = App._eventdict.get(hwevent.type, [])
+        table = App._dispatch
+        if table is None:
+            table = cls._dispatchTable()
+        evtlist = table.get(hwevent.type)
         if evtlist:
             evt = MouseEvent(cls, hwevent)
             cls._routeEvent(evt, evtlist)
@@ -119,11 +220,44 @@ class App:
         """
         if App.win is not None:
             App.win.add(obj.gfx)
+        cls._register(obj)
+
+    @classmethod
+    def _register(cls, obj):
         App.spritelist.append(obj)
-        # find out if sprite type is in dictionary without triggering pylint
-        if not App._spritesdict.get(type(obj), False):
-            App._spritesdict[type(obj)] = []
-        App._spritesdict[type(obj)].append(obj)
+        # index the sprite under its own class and every class it inherits
+        for sclass in cls._spriteClasses(obj):
+            App._spritesdict.setdefault(sclass, {})[obj] = None
+            App._spritesviews.pop(sclass, None)
+        cls._addToBroadPhase(obj)
+        if obj.continuous:
+            App._continuous[obj] = cls._extents(obj)
+        cls._addToLayers(obj, obj.collisionlayer)
+        handlers = cls._collisionHandlers(obj)
+        if handlers:
+            App._contacthandlers[obj] = handlers
+            if "onCollisionStay" in handlers:
+                App._stayhandlers += 1
+
+    @classmethod
+    def _spriteClasses(cls, obj):
+        sclasses = App._spritesclasses.get(type(obj))
+        if sclasses is None:
+            # every class in the hierarchy except object
+            sclasses = type(obj).__mro__[:-1]
+            App._spritesclasses[type(obj)] = sclasses
+        return sclasses
+
+    @classmethod
+    def _collisionHandlers(cls, obj):
+        # names of the collision event methods defined by the sprite class
+        handlers = App._collisionclasses.get(type(obj))
+        if handlers is None:
+            handlers = frozenset(
+                name for name in _collisionhandlers.values() if hasattr(obj, name)
+            )
+            App._collisionclasses[type(obj)] = handlers
+        return handlers
 
     @classmethod
     def remove(cls, obj):
@@ -133,14 +267,133 @@ class App:
         :param Sprite obj: The sprite reference to remove.
         :returns: None
         """
-        App.spritelist.remove(obj)
+        if obj in App._parked:
+            del App._parked[obj]
+        else:
+            cls._unregister(obj)
         # remove from underlying layer only if existed in ours
         if App.win is not None:
             App.win.remove(obj.gfx)
-        App._spritesdict[type(obj)].remove(obj)
+
+    @classmethod
+    def _unregister(cls, obj):
+        App.spritelist.remove(obj)
+        for sclass in cls._spriteClasses(obj):
+            del App._spritesdict[sclass][obj]
+            App._spritesviews.pop(sclass, None)
+        cls._removeFromBroadPhase(obj)
+        App._continuous.pop(obj, None)
+        cls._removeFromLayers(obj, obj.collisionlayer)
+        if "onCollisionStay" in App._contacthandlers.pop(obj, ()):
+            App._stayhandlers -= 1
+
+    @classmethod
+    def _addToBroadPhase(cls, obj):
+        if obj.static:
+            # the static tree is rebuilt when it is next needed
+            App._static[obj] = None
+            App._statictree = None
+            return
+        if App._spatialhash is not None:
+            obj.setExtents()
+            App._spatialhash.insert(obj)
+        if App._sweepandprune is not None:
+            App._sweepandprune.insert(obj)
+
+    @classmethod
+    def _removeFromBroadPhase(cls, obj):
+        if obj in App._static:
+            del App._static[obj]
+            App._statictree = None
+        if App._spatialhash is not None:
+            App._spatialhash.remove(obj)
+        if App._sweepandprune is not None:
+            App._sweepandprune.remove(obj)
+
+    @classmethod
+    def _staticTree(cls):
+        if App._statictree is None:
+            App._statictree = AABBTree(App._static)
+        return App._statictree
+
+    @classmethod
+    def _addToLayers(cls, obj, layer):
+        for bit in _bits(layer):
+            App._layers.setdefault(bit, {})[obj] = None
+        if App._layerviews:
+            App._layerviews = {}
+
+    @classmethod
+    def _removeFromLayers(cls, obj, layer):
+        for bit in _bits(layer):
+            members = App._layers[bit]
+            del members[obj]
+            if not members:
+                del App._layers[bit]
+        if App._layerviews:
+            App._layerviews = {}
+
+    @classmethod
+    def _park(cls, obj):
+        # keep the sprite on the stage, but out of every registry
+        cls._unregister(obj)
+        App._parked[obj] = None
+
+    @classmethod
+    def _unpark(cls, obj):
+        App._parked.pop(obj, None)
+        cls._register(obj)
+
+    @classmethod
+    def enableSpatialHash(cls, cellsize=64):
+        """
+        Begin maintaining a uniform grid (spatial hash) of all sprites. When
+        enabled, :meth:`~ggame.sprite.Sprite.collidingWithSprites` only
+        performs detailed collision checks against sprites that are near the
+        sprite being tested, instead of against every sprite in the
+        application. This is worthwhile for applications with hundreds or
+        thousands of sprites.
+
+        :param int cellsize: The width and height of each grid cell, in
+            pixels. A good choice is roughly the size of a typical sprite.
+
+        :returns: Nothing
+        """
+        App._spatialhash = SpatialHash(cellsize)
+        for sprite in App.spritelist:
+            if not sprite.static:
+                sprite.setExtents()
+                App._spatialhash.insert(sprite)
+
+    @classmethod
+    def disableSpatialHash(cls):
+        """
+        Stop maintaining the spatial hash created by
+        :meth:`enableSpatialHash`. Collision checks revert to testing against
+        every sprite.
+
+        :returns: Nothing
+        """
+        App._spatialhash = None
+
+    @staticmethod
+    def _extents(obj):
+        obj.setExtents()
+        return (obj.xmin, obj.ymin, obj.xmax, obj.ymax)
+
+    @classmethod
+    def _saveExtents(cls):
+        # starting extents for sprites in continuous collision mode
+        continuous = App._continuous
+        for sprite in continuous:
+            continuous[sprite] = cls._extents(sprite)
 
     def _animate(self, _dummy):
         if App.win:
+            # collision results only hold for the frame they were found in
+            App._pairresults = {}
+            if App._continuous:
+                App._saveExtents()
             try:
                 if self.userfunc:
                     self.userfunc()
@@ -149,8 +402,83 @@ class App:
             except BaseException:
                 traceback.print_exc()
                 raise
+            if App._contacthandlers or App._contacts or self._collisionListened():
+                App._collisionEvents()
+            if App._reaplist:
+                App._reap()
             App.win.animate(self._animate)
 
+    @staticmethod
+    def _collisionListened():
+        evtdict = App._eventdict
+        return bool(
+            evtdict.get(CollisionEvent.collisionenter)
+            or evtdict.get(CollisionEvent.collisionstay)
+            or evtdict.get(CollisionEvent.collisionexit)
+        )
+
+    @classmethod
+    def _collisionEvents(cls):
+        # contacts are keyed by sprite pair, so that unchanged contacts are
+        # found with a dictionary lookup
+        previous = App._contacts
+        current = {}
+        if cls._collisionListened():
+            for a, b in cls.collisionPairs():
+                current[(a, b) if id(a) < id(b) else (b, a)] = None
+        else:
+            # only sprites with handler methods need their contacts found
+            for a in App._contacthandlers:
+                for b in a.collidingWithSprites():
+                    current[(a, b) if id(a) < id(b) else (b, a)] = None
+        App._contacts = current
+        stay = App._stayhandlers or App._eventdict.get(CollisionEvent.collisionstay)
+        for pair in current:
+            if pair not in previous:
+                cls._routeCollision(CollisionEvent.collisionenter, *pair)
+            elif stay:
+                cls._routeCollision(CollisionEvent.collisionstay, *pair)
+        for pair in previous:
+            if pair not in current:
+                cls._routeCollision(CollisionEvent.collisionexit, *pair)
+
+    @classmethod
+    def _routeCollision(cls, eventtype, a, b):
+        table = App._dispatch
+        if table is None:
+            table = cls._dispatchTable()
+        evtlist = table.get(eventtype)
+        if evtlist:
+            cls._routeEvent(CollisionEvent(eventtype, a, b), evtlist)
+        name = _collisionhandlers[eventtype]
+        for sprite, other in ((a, b), (b, a)):
+            if name in App._contacthandlers.get(sprite, ()):
+                evt = CollisionEvent(eventtype, sprite, other)
+                cls._routeEvent(evt, [getattr(sprite, name)])
+
+    @classmethod
+    def destroyLater(cls, obj):
+        """
+        Schedule a sprite to be destroyed at the end of the current animation
+        frame, after the :meth:`step` method (or `userfunc`) has returned and
+        before the frame is drawn. Until then the sprite remains in
+        :data:`spritelist`, but it no longer collides with other sprites.
+
+        This is normally called via :meth:`~ggame.sprite.Sprite.destroyLater`.
+
+        :param Sprite obj: The sprite to destroy.
+        :returns: None
+        """
+        App._reaplist[obj] = None
+
+    @classmethod
+    def _reap(cls):
+        # sprites scheduled while reaping are left for the next frame
+        dying = App._reaplist
+        App._reaplist = {}
+        for sprite in dying:
+            sprite.destroy()
+
     @classmethod
     def destroy(cls):
         """
@@ -168,14 +496,30 @@ class App:
             App.win.unbind(MouseEvent.mouseup)
             App.win.unbind(MouseEvent.click)
             App.win.unbind(MouseEvent.dblclick)
-        for s in list(App.spritelist):
+        for s in list(App.spritelist) + list(App._parked):
             s.destroy()
         App.win.destroy()
         App.win = None
-        App.spritelist = []
+        App.spritelist = _SpriteList()
         App._spritesdict = {}
+        App._spritesviews = {}
+        App._spatialhash = None
+        App._sweepandprune = None
+        App._static = {}
+        App._statictree = None
+        App._pairresults = {}
         App._eventdict = {}
+        App._dispatch = None
         App._spritesadded = False
+        App._reaplist = {}
+        App._parked = {}
+        App._continuous = {}
+        App._layers = {}
+        App._layerviews = {}
+        App._contacts = {}
+        App._contacthandlers = {}
+        App._stayhandlers = 0
+        App._collisionclasses = {}
 
     @classmethod
     def listenKeyEvent(cls, eventtype, key, callback):
@@ -186,7 +530,8 @@ class App:
             receive (value is one of: `'keydown'`, `'keyup'` or `'keypress'`).
 
         :param str key:  Identify the keyboard key (e.g. `'space'`,
-            `'left arrow'`, etc.) to receive events for.
+            `'left arrow'`, etc.) to receive events for, or `'*'` to receive
+            events for every key.
 
         :param function callback:  The function or method that will be
             called with the :class:`~ggame.event.KeyEvent` object when the
@@ -202,6 +547,7 @@ class App:
         if callback not in evtlist:
             evtlist.append(callback)
         App._eventdict[(eventtype, key)] = evtlist
+        App._dispatch = None
 
     @classmethod
     def listenMouseEvent(cls, eventtype, callback):
@@ -222,6 +568,7 @@ class App:
         if callback not in evtlist:
             evtlist.append(callback)
         App._eventdict[eventtype] = evtlist
+        App._dispatch = None
 
     @classmethod
     def unlistenKeyEvent(cls, eventtype, key, callback):
@@ -247,6 +594,7 @@ class App:
 
         """
         App._eventdict[(eventtype, key)].remove(callback)
+        App._dispatch = None
 
     @classmethod
     def unlistenMouseEvent(cls, eventtype, callback):
@@ -266,17 +614,273 @@ class App:
         :returns: Nothing
         """
         App._eventdict[eventtype].remove(callback)
+        App._dispatch = None
+
+    @classmethod
+    def listenCollisionEvent(cls, eventtype, callback):
+        """
+        Register to receive collision events. Once per animation frame, after
+        the :meth:`step` method (or `userfunc`) has returned and before the
+        frame is drawn, the sprites that are in contact are found with
+        :meth:`collisionPairs` and compared with those found in the previous
+        frame.
+
+        :param str eventtype: The type of collision event to receive (value
+            is one of: `'collisionenter'`, when two sprites start touching,
+            `'collisionstay'`, for every frame that they remain in contact,
+            or `'collisionexit'`, when they stop touching).
+
+        :param function callback: The function or method that will be
+            called with the :class:`~ggame.event.CollisionEvent` object when
+            the event occurs. It is called once for each pair of sprites.
+
+        :returns: Nothing
+
+        Alternatively, a :class:`~ggame.sprite.Sprite` subclass may define
+        any of the methods `onCollisionEnter`, `onCollisionStay` or
+        `onCollisionExit`. These are called with a
+        :class:`~ggame.event.CollisionEvent` whose `sprite` attribute is the
+        sprite itself, without needing to register for events. When no
+        callback is registered, only the contacts of sprites with these
+        methods are found, with
+        :meth:`~ggame.sprite.Sprite.collidingWithSprites`.
+        """
+        evtlist = App._eventdict.get(eventtype, [])
+        if callback not in evtlist:
+            evtlist.append(callback)
+        App._eventdict[eventtype] = evtlist
+        App._dispatch = None
+
+    @classmethod
+    def unlistenCollisionEvent(cls, eventtype, callback):
+        """
+        Use this method to remove a registration to receive a particular
+        collision event. Arguments must exactly match those used when
+        registering for the event.
+
+        :param str eventtype: The type of collision event to stop receiving
+            (value is one of: `'collisionenter'`, `'collisionstay'` or
+            `'collisionexit'`).
+
+        :param function callback: The function or method that will no longer
+            be called with the :class:`~ggame.event.CollisionEvent` object when
+            the event occurs.
+
+        :returns: Nothing
+        """
+        App._eventdict[eventtype].remove(callback)
+        App._dispatch = None
 
     @classmethod
     def getSpritesbyClass(cls, sclass):
         """
-        Returns a list of all active sprites of a given class.
+        Returns all active sprites of a given class, including sprites of any
+        class derived from it.
 
         :param class sclass: A class name (e.g. 'Sprite') or subclass.
 
-        :returns: A (potentially empty) list of sprite references.
+        :returns: A (potentially empty) read-only sequence (tuple) of sprite
+            references. The same sequence is returned by repeated calls until
+            a sprite of the class is added or removed.
+        """
+        view = App._spritesviews.get(sclass)
+        if view is None:
+            view = tuple(App._spritesdict.get(sclass, ()))
+            App._spritesviews[sclass] = view
+        return view
+
+    @classmethod
+    def getSpritesbyLayer(cls, mask):
+        """
+        Returns all active sprites in any of the collision layers given by a
+        bit mask. See :data:`~ggame.sprite.Sprite.collisionlayer`.
+
+        :param int mask: A bit mask of collision layers, such as a sprite's
+            :data:`~ggame.sprite.Sprite.collisionmask`.
+
+        :returns: A (potentially empty) read-only sequence (tuple) of sprite
+            references. The same sequence is returned by repeated calls until
+            a sprite is added to or removed from any layer.
+        """
+        view = App._layerviews.get(mask)
+        if view is None:
+            members = {}
+            for bit, sprites in App._layers.items():
+                if bit & mask:
+                    members.update(sprites)
+            view = App._layerviews[mask] = tuple(members)
+        return view
+
+    @classmethod
+    def collisionPairs(cls, classA=None, classB=None):
+        """
+        Find every pair of sprites that are currently colliding. Each
+        colliding pair is reported only once, which is much cheaper than
+        calling :meth:`~ggame.sprite.Sprite.collidingWithSprites` from every
+        sprite's step method.
+
+        Candidate pairs are found by sweeping the sprite extents along the x
+        axis. The sorted order is kept from one call to the next, so calling
+        this once per frame takes advantage of sprites moving only a little
+        between frames.
+
+        Sprites in :data:`~ggame.sprite.Sprite.continuous` mode are also
+        paired with any sprite they touched earlier in the frame.
+
+        :data:`~ggame.sprite.Sprite.static` sprites are found by searching
+        the static tree with each moving sprite's extents, and are never
+        paired with each other.
+
+        :param class classA: The class of the first sprite in each pair. If
+            `None` then any sprite may be first.
+
+        :param class classB: The class of the second sprite in each pair. If
+            `None` then any sprite may be second.
+
+        :rtype: list
+
+        :returns: A (potentially empty) list of `(spriteA, spriteB)` tuples,
+            where `spriteA` is an instance of `classA` and `spriteB` is an
+            instance of `classB`.
+        """
+        if App._sweepandprune is None:
+            App._sweepandprune = SweepAndPrune()
+            for sprite in App.spritelist:
+                if not sprite.static:
+                    App._sweepandprune.insert(sprite)
+        sweep = App._sweepandprune
+        found = []
+        for a, b in sweep.pairs():
+            if cls._pairMatches(a, b, classA, classB):
+                pair = (a, b)
+            elif cls._pairMatches(b, a, classA, classB):
+                pair = (b, a)
+            else:
+                continue
+            if a.collidingWith(b):
+                found.append(pair)
+        if App._static:
+            cls._staticPairs(sweep, found, classA, classB)
+        if App._continuous:
+            cls._continuousPairs(found, classA, classB)
+        return found
+
+    @classmethod
+    def _staticPairs(cls, sweep, found, classA, classB):
+        tree = cls._staticTree()
+        # extents of the moving sprites were refreshed by the sweep
+        for a in sweep:
+            for b in tree.query(a.xmin, a.ymin, a.xmax, a.ymax):
+                if cls._pairMatches(a, b, classA, classB):
+                    pair = (a, b)
+                elif cls._pairMatches(b, a, classA, classB):
+                    pair = (b, a)
+                else:
+                    continue
+                if a.collidingWith(b):
+                    found.append(pair)
+
+    @classmethod
+    def _continuousPairs(cls, found, classA, classB):
+        # fast sprites may have passed through sprites whose extents they no
+        # longer overlap, so the sweep above did not pair them
+        seen = {frozenset(pair) for pair in found}
+        for a in list(App._continuous):
+            for b in a.collidingWithSprites():
+                key = frozenset((a, b))
+                if key in seen:
+                    continue
+                seen.add(key)
+                if cls._pairMatches(a, b, classA, classB):
+                    found.append((a, b))
+                elif cls._pairMatches(b, a, classA, classB):
+                    found.append((b, a))
+
+    @classmethod
+    def segmentQuery(cls, p0, p1, sclass=None):
+        """
+        Find every sprite that a line segment passes through, such as a line
+        of sight or the path of a bullet. Each sprite's extents are tested
+        first, then its collision boundary.
+
+        If the spatial hash has been enabled with :meth:`enableSpatialHash`
+        then only sprites in the grid cells along the segment are tested.
+        Otherwise every sprite is tested. :data:`~ggame.sprite.Sprite.static`
+        sprites are always found through the static tree.
+
+        :param tuple(float,float) p0: The (x,y) start of the segment.
+
+        :param tuple(float,float) p1: The (x,y) end of the segment.
+
+        :param class sclass: A :class:`~ggame.sprite.Sprite` class or
+            subclass of the sprites to find. If `None` then sprites of any
+            class are found.
+
+        :rtype: list
+
+        :returns: A (potentially empty) list of `(sprite, distance)` tuples,
+            nearest first, where `distance` is measured from `p0` to the point
+            where the segment enters the sprite.
+        """
+        if App._spatialhash is not None:
+            slist = App._spatialhash.querySegment(p0[0], p0[1], p1[0], p1[1])
+            if sclass is not None:
+                slist = [s for s in slist if isinstance(s, sclass)]
+        elif sclass is None:
+            slist = App.spritelist
+        else:
+            slist = App.getSpritesbyClass(sclass)
+        if App._static:
+            # static sprites are found through the static tree instead
+            slist = [s for s in slist if not s.static]
+            slist.extend(
+                s
+                for s in cls._staticTree().querySegment(p0[0], p0[1], p1[0], p1[1])
+                if sclass is None or isinstance(s, sclass)
+            )
+        length = math.hypot(p1[0] - p0[0], p1[1] - p0[1])
+        hits = []
+        for sprite in slist:
+            t = sprite.segmentEntry(p0, p1)
+            if t is not None:
+                hits.append((sprite, t * length))
+        hits.sort(key=_distancekey)
+        return hits
+
+    @classmethod
+    def raycast(cls, origin, direction, maxdist, sclass=None):
         """
-        return App._spritesdict.get(sclass, [])[:]
+        Find every sprite hit by a ray, such as a hitscan weapon. This is the
+        same as :meth:`segmentQuery` for a segment of length `maxdist`.
+
+        :param tuple(float,float) origin: The (x,y) start of the ray.
+
+        :param tuple(float,float) direction: An (x,y) vector in the direction
+            of the ray. It need not have unit length.
+
+        :param float maxdist: The length of the ray.
+
+        :param class sclass: A :class:`~ggame.sprite.Sprite` class or
+            subclass of the sprites to find. If `None` then sprites of any
+            class are found.
+
+        :rtype: list
+
+        :returns: A (potentially empty) list of `(sprite, distance)` tuples,
+            nearest first.
+        """
+        length = math.hypot(direction[0], direction[1])
+        if length == 0:
+            raise ValueError("ray direction must not be zero")
+        scale = maxdist / length
+        end = (origin[0] + direction[0] * scale, origin[1] + direction[1] * scale)
+        return cls.segmentQuery(origin, end, sclass)
+
+    @staticmethod
+    def _pairMatches(first, second, classA, classB):
+        return (classA is None or isinstance(first, classA)) and (
+            classB is None or isinstance(second, classB)
+        )
 
     def step(self):
         """
@@ -304,3 +908,22 @@ class App:
         """
         self.userfunc = userfunc
         App.win.animate(self._animate)
+
+
+_collisionhandlers = {
+    CollisionEvent.collisionenter: "onCollisionEnter",
+    CollisionEvent.collisionstay: "onCollisionStay",
+    CollisionEvent.collisionexit: "onCollisionExit",
+}
+
+
+def _distancekey(hit):
+    return hit[1]
+
+
+def _bits(value):
+    # each set bit of a non-negative integer
+    while value:
+        bit = value & -value
+        yield bit
+        value ^= bit
@@ -11,7 +11,9 @@ from ggame.sysdeps import (
     GFX_Graphics,
     GFX_Texture_fromImage,
     GFX_Text,
+    GFX_Mask,
 )
+from ggame.geometry import convexHull, convexDecomposition, simplifyPolygon
 
 
 class Frame(object):  # pylint: disable=useless-object-inheritance
@@ -117,6 +119,13 @@ class _Asset(object):  # pylint: disable=useless-object-inheritance
         A list of the underlying system objects used to represent this
         asset.
         """
+        self._texture = None
+        self._texturerefs = 0
+        self._destroyed = False
+        self._basevertexcache = None
+        self._hullcache = None
+        self._piececache = None
+        self._shapecache = {}
 
     @property
     def gfx(self):
@@ -162,11 +171,104 @@ class _Asset(object):  # pylint: disable=useless-object-inheritance
 
         return Iter(self)
 
+    @property
+    def _basevertices(self):
+        """
+        Sprite-relative boundary vertices for collision detection, computed
+        once and shared by every sprite that uses this asset.
+        """
+        if self._basevertexcache is None:
+            self._basevertexcache = tuple(self._makeBaseVertices())
+        return self._basevertexcache
+
+    @property
+    def _hullvertices(self):
+        """
+        Convex hull of :attr:`_basevertices`, computed once and shared.
+        """
+        if self._hullcache is None:
+            self._hullcache = tuple(convexHull(self._basevertices))
+        return self._hullcache
+
+    @property
+    def _convexpieces(self):
+        """
+        Convex polygons that together cover :attr:`_basevertices`, computed
+        once and shared.
+        """
+        if self._piececache is None:
+            self._piececache = tuple(tuple(p) for p in self._makeConvexPieces())
+        return self._piececache
+
+    def _makeBaseVertices(self):
+        """
+        Override to list the boundary vertices of the asset. Assets without
+        a polygonal boundary have none.
+        """
+        return ()
+
+    def _makeConvexPieces(self):
+        """
+        Override to divide a concave boundary into convex pieces. By default
+        the boundary is treated as its convex hull.
+        """
+        return (self._hullvertices,)
+
+    def _invalidateVertices(self):
+        self._basevertexcache = None
+        self._hullcache = None
+        self._piececache = None
+        self._shapecache = {}
+
+    @staticmethod
+    def _rectangleVertices(width, height):
+        return [(0, 0), (0, height), (width, height), (width, 0)]
+
+    @staticmethod
+    def _normalizedVertices(points):
+        xpoints, ypoints = zip(*points)
+        xmin = min(xpoints)
+        ymin = min(ypoints)
+        return [(x - xmin, y - ymin) for x, y in points]
+
+    def _acquireTexture(self):
+        """
+        Return a texture generated from this asset, shared by every sprite
+        that uses it. Each call must be balanced by :meth:`_releaseTexture`.
+        """
+        if self._texture is None:
+            self._texture = self.gfx.generateTexture()
+        self._texturerefs += 1
+        return self._texture
+
+    def _releaseTexture(self):
+        """
+        Release a reference to the shared texture. The texture is freed when
+        the asset has been destroyed and no sprite is using it.
+        """
+        self._texturerefs -= 1
+        if self._destroyed and self._texturerefs <= 0:
+            self._freeTexture()
+
+    def _freeTexture(self):
+        if self._texture is not None:
+            try:
+                self._texture.destroy(True)
+            except BaseException:
+                pass
+            self._texture = None
+        self._texturerefs = 0
+
     def destroy(self):
         """
         Destroy or deallocate any underlying graphics resources used by the
         asset. Call this method on any asset that is no longer being used.
+        A texture shared by sprites created from this asset is freed once the
+        last of those sprites has been destroyed.
         """
+        self._destroyed = True
+        if self._texturerefs <= 0:
+            self._freeTexture()
         if hasattr(self, "gfx"):
             try:
                 for gfx in self.gfxlist:
@@ -208,17 +310,31 @@ class ImageAsset(_Asset):
         images in the list are assumed to be the same size, but separated by the
         `margin` value.
 
+    :param boolean pixelmask=False: If `True`, sprites using this asset
+        collide only where their images are opaque, rather than anywhere
+        within their rectangles. A mask of opaque pixels is built once for
+        each image in the asset. Pixel masks are used only while a sprite is
+        neither rotated nor scaled, and are not available when running in
+        the browser.
+
     Example:
 
     .. literalinclude:: ../examples/assetimage.py
     """
 
-    def __init__(self, url, frame=None, qty=1, direction="horizontal", margin=0):
+    def __init__(
+        self, url, frame=None, qty=1, direction="horizontal", margin=0, pixelmask=False
+    ):
         super().__init__()
         self.url = url
         """
         A string that represents the path or url of the original file.
         """
+        self.pixelmask = pixelmask
+        """
+        `True` if sprites using this asset collide using pixel masks.
+        """
+        self._masks = {}
         del self.gfxlist[0]
         self.width = self.height = 0
         self.append(url, frame, qty, direction, margin)
@@ -253,6 +369,22 @@ class ImageAsset(_Asset):
                 self.width = gfx.width
                 self.height = gfx.height
             self.gfxlist.append(gfx)
+        self._invalidateVertices()
+
+    def _makeBaseVertices(self):
+        return self._rectangleVertices(self.width, self.height)
+
+    def _mask(self, index=0):
+        """
+        Return the pixel mask for one of the images in the asset, built on
+        first use, or `None` if masks are not available.
+        """
+        try:
+            return self._masks[index]
+        except KeyError:
+            # pylint: disable=assignment-from-none
+            mask = self._masks[index] = GFX_Mask(self.gfxlist[index])
+            return mask
 
 
 class Color:
@@ -382,6 +514,9 @@ class RectangleAsset(_ShapeAsset):
         """The `gfx` property represents the underlying system object."""
         self.gfx.visible = False
 
+    def _makeBaseVertices(self):
+        return self._rectangleVertices(self.width, self.height)
+
 
 class CircleAsset(_ShapeAsset):
     """
@@ -401,6 +536,47 @@ class CircleAsset(_ShapeAsset):
         self.gfx.visible = False
 
 
+class CircleGroupAsset(_Asset):
+    """
+    The `ggame.CircleGroupAsset` describes a collision boundary made of
+    several circles. It has no appearance of its own: use it as the `edgedef`
+    argument of a :class:`~ggame.sprite.Sprite`. A character may be covered
+    by a few overlapping circles much more closely than by a single circle,
+    while colliding almost as cheaply.
+
+    The circles move, rotate and scale with the sprite.
+
+    :param list circles: A list of `((x, y), radius)` tuples, one for each
+        circle. Each (x, y) center is in pixels, relative to the upper left
+        corner of the sprite's (unscaled) image.
+
+    Example of use::
+
+        body = CircleGroupAsset([((16, 10), 8), ((16, 28), 12)])
+        hero = Sprite(ImageAsset("hero.png"), (100, 100), body)
+    """
+
+    def __init__(self, circles):
+        super().__init__()
+        if not circles:
+            raise ValueError("CircleGroupAsset requires at least one circle")
+        self.circles = tuple(((x, y), radius) for (x, y), radius in circles)
+        """
+        This attribute is a tuple of the `((x, y), radius)` circles supplied
+        during instantiation.
+        """
+
+    def _makeBaseVertices(self):
+        # corners of the square around each circle, which enclose the group
+        # in any orientation
+        points = []
+        for (x, y), r in self.circles:
+            points.extend(
+                [(x - r, y - r), (x - r, y + r), (x + r, y + r), (x + r, y - r)]
+            )
+        return points
+
+
 class EllipseAsset(_ShapeAsset):
     """
     The `ggame.EllipseAsset` is a "virtual" asset that is created on the
@@ -423,6 +599,9 @@ class EllipseAsset(_ShapeAsset):
         """The `gfx` property represents the underlying system object."""
         self.gfx.visible = False
 
+    def _makeBaseVertices(self):
+        return self._rectangleVertices(self.halfw * 2, self.halfh * 2)
+
 
 class PolygonAsset(_ShapeAsset):
     """
@@ -437,8 +616,17 @@ class PolygonAsset(_ShapeAsset):
         should not be in absolute screen coordinates, but should be relative to
         the desired 'center' of the resulting :class:`Sprite`. The final
         coordinate pair in the list must be the same as the first.
+        The path may be concave. For collision tests, a concave path is
+        divided into convex pieces the first time it is needed, and the
+        pieces are shared by every sprite that uses the asset.
     :param LineStyle line=BLACKLINE: The color and width of the ellipse border
     :param Color fill=BLACK: The color of the ellipse body
+    :param float tolerance=0: If greater than zero, the boundary used for
+        collision tests is simplified by removing vertices that lie within
+        `tolerance` pixels of the simplified outline. This makes collision
+        tests much faster for paths with many vertices, such as outlines
+        traced from artwork. The path that is drawn is not changed. See
+        :data:`removedvertices`.
 
     Example:
 
@@ -446,8 +634,15 @@ class PolygonAsset(_ShapeAsset):
 
     """
 
-    def __init__(self, path, line=BLACKLINE, fill=BLACK):
+    def __init__(self, path, line=BLACKLINE, fill=BLACK, tolerance=0):
         super().__init__(line, fill)
+        if tolerance < 0:
+            raise ValueError("tolerance must not be negative")
+        self.tolerance = tolerance
+        """
+        This attribute represents the `tolerance` parameter supplied during
+        instantiation.
+        """
         self.path = path[:]
         jpath = []
         # close the path if necessary
@@ -459,6 +654,23 @@ class PolygonAsset(_ShapeAsset):
         """The `gfx` property represents the underlying system object."""
         self.gfx.visible = False
 
+    def _makeBaseVertices(self):
+        # simplify after normalizing, so that the boundary stays in place
+        vertices = self._normalizedVertices(self.path[:-1])
+        return simplifyPolygon(vertices, self.tolerance)
+
+    @property
+    def removedvertices(self):
+        """
+        The number of path vertices that were left out of the collision
+        boundary because of the `tolerance` parameter. This attribute is
+        read-only.
+        """
+        return len(self.path) - 1 - len(self._basevertices)
+
+    def _makeConvexPieces(self):
+        return convexDecomposition(self._basevertices)
+
 
 class LineAsset(_CurveAsset):
     """
@@ -496,6 +708,9 @@ class LineAsset(_CurveAsset):
         """The `gfx` property represents the underlying system object."""
         self.gfx.visible = False
 
+    def _makeBaseVertices(self):
+        return self._normalizedVertices([(0, 0), (self.delta_x, self.delta_y)])
+
 
 class TextAsset(_GraphicsAsset):
     """
@@ -544,6 +759,9 @@ class TextAsset(_GraphicsAsset):
         self.gfx.alpha = self.fill.alpha
         self.gfx.visible = False
 
+    def _makeBaseVertices(self):
+        return self._rectangleVertices(self.width, self.height)
+
     def clone(self):
         """
         Create a duplicate asset with the current style settings.
@@ -246,5 +246,19 @@ class Circle(_MathVisual):
         outer = pradius + style.width / 2
         return inner <= r <= outer
 
+    def physicalExtents(self):
+        x, y = self._spposinputs.pos
+        try:
+            pradius = (
+                MathApp.distance(self._posinputs.pos(), self._nposinputs.radius())
+                * MathApp.scale
+            )
+        except (AttributeError, TypeError):
+            # pylint: disable=no-member
+            pradius = self._nposinputs.radius() * MathApp.scale
+            # pylint: enable=no-member
+        outer = pradius + self._stdinputs.style().width / 2
+        return x - outer, y - outer, x + outer, y + outer
+
     def translate(self, pdisp):
         pass
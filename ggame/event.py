@@ -11,9 +11,9 @@ import traceback
 
 
 class _Event:
-    def __init__(self, hwevent):
+    def __init__(self, hwevent, eventtype=None):
         self.hwevent = hwevent
-        self.type = hwevent.type
+        self.type = hwevent.type if eventtype is None else eventtype
         """String representing the type of received system event."""
         self.consumed = False
         """
@@ -59,15 +59,37 @@ class MouseEvent(_Event):
             self.wheeldelta = hwevent.deltaY
         else:
             self.wheeldelta = 0
-        rect = app.win.renderer.view.getBoundingClientRect()
-        xscale = app.win.width / rect.width
-        yscale = app.win.height / rect.height
-        self.x = (hwevent.clientX - rect.left) * xscale
+        # the window measures the canvas once per frame, not once per event
+        left, top, xscale, yscale = app.win.geometry()
+        self.x = (hwevent.clientX - left) * xscale
         """The window x-coordinate of the mouse pointer when the event occurred."""
-        self.y = (hwevent.clientY - rect.top) * yscale
+        self.y = (hwevent.clientY - top) * yscale
         """The window y-coordinate of the mouse pointer when the event occurred."""
 
 
+class CollisionEvent(_Event):
+    """
+    A CollisionEvent object reports that two sprites started touching,
+    remained in contact, or stopped touching during the last animation frame.
+    This class is not instantiated by the ggame user.
+    """
+
+    collisionenter = "collisionenter"
+    collisionstay = "collisionstay"
+    collisionexit = "collisionexit"
+
+    def __init__(self, eventtype, sprite, other):
+        """
+        The event is initialized by the system, with the event type and the
+        two sprites in contact.
+        """
+        super().__init__(None, eventtype)
+        self.sprite = sprite
+        """The sprite receiving the event."""
+        self.other = other
+        """The sprite that `sprite` is (or was) in contact with."""
+
+
 class KeyEvent(_Event):
     """
     A KeyEvent object encapsulates information regarding a user keyboard
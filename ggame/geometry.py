@@ -0,0 +1,467 @@
+"""
+Geometry helpers used by the :class:`~ggame.sprite.Sprite` collision tests.
+Polygons are represented as lists of (x, y) vertex tuples, in order, with
+the closing vertex omitted.
+"""
+import math
+
+
+def edgeNormals(vertices):
+    """
+    Compute a (not normalized) normal vector for every edge of a polygon.
+    These are the candidate separating axes for :func:`polygonsOverlap`.
+
+    :param list vertices: Polygon vertices as (x, y) tuples.
+    :rtype: list
+    :returns: A list of (x, y) normal vectors, one per edge.
+    """
+    normals = []
+    x0, y0 = vertices[-1]
+    for x1, y1 in vertices:
+        if x1 != x0 or y1 != y0:
+            normals.append((y0 - y1, x1 - x0))
+        x0, y0 = x1, y1
+    return normals
+
+
+def _project(vertices, nx, ny):
+    lo = hi = vertices[0][0] * nx + vertices[0][1] * ny
+    for x, y in vertices:
+        p = x * nx + y * ny
+        if p < lo:
+            lo = p
+        elif p > hi:
+            hi = p
+    return lo, hi
+
+
+def _separated(va, vb, normals):
+    for nx, ny in normals:
+        amin, amax = _project(va, nx, ny)
+        bmin, bmax = _project(vb, nx, ny)
+        if amin > bmax or bmin > amax:
+            return True
+    return False
+
+
+def polygonsOverlap(va, na, vb, nb):
+    """
+    Separating axis test for two convex polygons. Touching polygons are
+    considered to overlap.
+
+    :param list va: Vertices of the first polygon.
+    :param list na: Edge normals of the first polygon (see
+        :func:`edgeNormals`).
+    :param list vb: Vertices of the second polygon.
+    :param list nb: Edge normals of the second polygon.
+    :rtype: boolean
+    :returns: `True` if no separating axis exists, `False` otherwise.
+    """
+    return not (_separated(va, vb, na) or _separated(va, vb, nb))
+
+
+def pointInPolygon(point, vertices):
+    """
+    Determine whether a point lies inside a polygon, using the crossing
+    number rule. The polygon need not be convex.
+
+    :param tuple(float,float) point: The (x, y) point to test.
+    :param list vertices: Polygon vertices as (x, y) tuples.
+    :rtype: boolean
+    :returns: `True` if the point is inside the polygon.
+    """
+    px, py = point
+    inside = False
+    x0, y0 = vertices[-1]
+    for x1, y1 in vertices:
+        if (y1 > py) != (y0 > py):
+            if px < x0 + (py - y0) * (x1 - x0) / (y1 - y0):
+                inside = not inside
+        x0, y0 = x1, y1
+    return inside
+
+
+def closestPointOnSegment(point, p0, p1):
+    """
+    Find the point on a line segment that is closest to another point.
+
+    :param tuple(float,float) point: The (x, y) point.
+    :param tuple(float,float) p0: The (x, y) start of the segment.
+    :param tuple(float,float) p1: The (x, y) end of the segment.
+    :rtype: tuple(float,float)
+    :returns: The closest (x, y) point on the segment.
+    """
+    dx = p1[0] - p0[0]
+    dy = p1[1] - p0[1]
+    lensq = dx * dx + dy * dy
+    if lensq == 0:
+        return p0
+    t = ((point[0] - p0[0]) * dx + (point[1] - p0[1]) * dy) / lensq
+    t = min(1.0, max(0.0, t))
+    return (p0[0] + t * dx, p0[1] + t * dy)
+
+
+def circleTouchesPolygon(center, radius, vertices):
+    """
+    Determine whether a circle overlaps a polygon, by finding the point on
+    the polygon boundary closest to the circle center. The polygon need not
+    be convex.
+
+    :param tuple(float,float) center: The (x, y) circle center.
+    :param float radius: The circle radius.
+    :param list vertices: Polygon vertices as (x, y) tuples.
+    :rtype: boolean
+    :returns: `True` if the circle and polygon overlap or touch.
+    """
+    rsq = radius * radius
+    cx, cy = center
+    p0 = vertices[-1]
+    for p1 in vertices:
+        x, y = closestPointOnSegment(center, p0, p1)
+        if (x - cx) ** 2 + (y - cy) ** 2 <= rsq:
+            return True
+        p0 = p1
+    return len(vertices) > 2 and pointInPolygon(center, vertices)
+
+
+def _cross(o, a, b):
+    return (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+
+
+def convexHull(points):
+    """
+    Compute the convex hull of a set of points using Andrew's monotone chain
+    algorithm. Collinear points on the hull boundary are dropped.
+
+    :param list points: A list of (x, y) tuples.
+    :rtype: list
+    :returns: The hull vertices as (x, y) tuples, in order. Fewer than three
+        vertices are returned if the points are collinear.
+    """
+    pts = sorted(set(points))
+    if len(pts) <= 2:
+        return pts
+
+    lower = []
+    for p in pts:
+        while len(lower) >= 2 and _cross(lower[-2], lower[-1], p) <= 0:
+            lower.pop()
+        lower.append(p)
+    upper = []
+    for p in reversed(pts):
+        while len(upper) >= 2 and _cross(upper[-2], upper[-1], p) <= 0:
+            upper.pop()
+        upper.append(p)
+    return lower[:-1] + upper[:-1]
+
+
+def _isConvex(vertices):
+    # every turn in the same (positive) direction
+    n = len(vertices)
+    return all(
+        _cross(vertices[i - 2], vertices[i - 1], vertices[i]) >= 0 for i in range(n)
+    )
+
+
+def _inTriangle(p, a, b, c):
+    return _cross(a, b, p) >= 0 and _cross(b, c, p) >= 0 and _cross(c, a, p) >= 0
+
+
+def triangulate(vertices):
+    """
+    Divide a simple polygon into triangles by ear clipping. The polygon need
+    not be convex. No triangle is empty: repeated vertices, and collinear
+    vertices that would leave an empty triangle, are dropped.
+
+    :param list vertices: Polygon vertices as (x, y) tuples, in either
+        winding order.
+    :rtype: list
+    :returns: A list of triangles, each a tuple of three (x, y) vertices
+        wound in the same direction as the other triangles, or `None` if the
+        polygon intersects itself and cannot be triangulated.
+    """
+    pts = [p for i, p in enumerate(vertices) if p != vertices[i - 1]]
+    area = sum(_cross((0, 0), pts[i - 1], pts[i]) for i in range(len(pts)))
+    if area < 0:
+        pts.reverse()
+    remaining = list(pts)
+    triangles = []
+    while len(remaining) > 3:
+        n = len(remaining)
+        for i in range(n):
+            a, b, c = remaining[i - 1], remaining[i], remaining[(i + 1) % n]
+            turn = _cross(a, b, c)
+            if turn == 0:
+                # b adds nothing to the outline
+                del remaining[i]
+                break
+            if turn < 0:
+                continue
+            # an ear contains no other vertex of the polygon
+            if not any(
+                _inTriangle(p, a, b, c) for p in remaining if p not in (a, b, c)
+            ):
+                triangles.append((a, b, c))
+                del remaining[i]
+                break
+        else:
+            return None
+    if len(remaining) == 3 and _cross(*remaining) > 0:
+        triangles.append(tuple(remaining))
+    # the ears of a polygon that crosses itself do not add up to its area
+    total = sum(_cross(*t) for t in triangles)
+    if abs(total - abs(area)) > 1e-9 * max(total, abs(area)):
+        return None
+    return triangles
+
+
+def convexDecomposition(vertices):
+    """
+    Divide a simple polygon into a small number of convex pieces, using the
+    Hertel-Mehlhorn algorithm: triangulate the polygon, then remove every
+    diagonal whose two neighbouring pieces would still be convex without it.
+    The result has at most four times as many pieces as the fewest possible.
+
+    :param list vertices: Polygon vertices as (x, y) tuples, in either
+        winding order.
+    :rtype: list
+    :returns: A list of convex polygons, each a list of (x, y) vertices. A
+        convex polygon is returned as the only piece. A polygon that
+        intersects itself is returned as its convex hull.
+    """
+    triangles = triangulate(vertices)
+    if triangles is None:
+        return [convexHull(vertices)]
+    pieces = [list(t) for t in triangles]
+    merged = True
+    while merged and len(pieces) > 1:
+        merged = False
+        # each diagonal is an edge shared, in opposite directions, by two pieces
+        edges = {}
+        for k, piece in enumerate(pieces):
+            for i, p in enumerate(piece):
+                edges[(piece[i - 1], p)] = (k, i - 1)
+        for (u, v), (ka, ia) in edges.items():
+            other = edges.get((v, u))
+            if other is None or other[0] == ka:
+                continue
+            kb, ib = other
+            a = pieces[ka]
+            b = pieces[kb]
+            # walk a from v round to u, then b from u round to v
+            ia %= len(a)
+            ib %= len(b)
+            joined = a[ia + 1 :] + a[: ia + 1] + (b[ib + 1 :] + b[: ib + 1])[1:-1]
+            if _isConvex(joined):
+                pieces[ka] = joined
+                del pieces[kb]
+                merged = True
+                break
+    return pieces
+
+
+def _distanceSq(point, p0, p1):
+    x, y = closestPointOnSegment(point, p0, p1)
+    return (x - point[0]) ** 2 + (y - point[1]) ** 2
+
+
+def simplifyPolygon(vertices, tolerance):
+    """
+    Remove polygon vertices that lie close to the outline of the remaining
+    vertices, using the Ramer-Douglas-Peucker algorithm. The closed outline
+    is split at its first vertex and the vertex farthest from it, and each
+    half is simplified in turn.
+
+    :param list vertices: Polygon vertices as (x, y) tuples.
+    :param float tolerance: The greatest distance, in pixels, between a
+        removed vertex and the simplified outline.
+    :rtype: list
+    :returns: The kept vertices, in their original order. At least three
+        vertices are always kept.
+    """
+    n = len(vertices)
+    if tolerance <= 0 or n <= 3:
+        return list(vertices)
+    first = vertices[0]
+    far = max(range(n), key=lambda i: _distanceSq(vertices[i], first, first))
+    keep = [False] * n
+    keep[0] = keep[far] = True
+    tolsq = tolerance * tolerance
+    # index n stands for vertex 0, closing the outline
+    stack = [(0, far), (far, n)]
+    while stack:
+        i, j = stack.pop()
+        p0 = vertices[i]
+        p1 = vertices[j % n]
+        best = None
+        bestsq = tolsq
+        for k in range(i + 1, j):
+            dsq = _distanceSq(vertices[k], p0, p1)
+            if dsq > bestsq:
+                best = k
+                bestsq = dsq
+        if best is not None:
+            keep[best] = True
+            stack.append((i, best))
+            stack.append((best, j))
+    if keep.count(True) < 3:
+        # a sliver: keep the vertex farthest from the line through the others
+        third = max(
+            range(n), key=lambda i: _distanceSq(vertices[i], first, vertices[far])
+        )
+        keep[third] = True
+    return [p for p, kept in zip(vertices, keep) if kept]
+
+
+def masksOverlap(maska, ax, ay, maskb, bx, by):
+    """
+    Determine whether two pixel masks share an opaque pixel. A mask is a list
+    of integers, one per row, with bit `x` of a row set if the pixel in
+    column `x` is opaque.
+
+    :param list maska: The first mask.
+    :param int ax: The x-coordinate of the upper left corner of `maska`.
+    :param int ay: The y-coordinate of the upper left corner of `maska`.
+    :param list maskb: The second mask.
+    :param int bx: The x-coordinate of the upper left corner of `maskb`.
+    :param int by: The y-coordinate of the upper left corner of `maskb`.
+    :rtype: boolean
+    :returns: `True` if the masks overlap.
+    """
+    dx = bx - ax
+    dy = by - ay
+    for y in range(max(0, dy), min(len(maska), dy + len(maskb))):
+        rowa = maska[y]
+        rowb = maskb[y - dy]
+        if dx >= 0:
+            if rowa & (rowb << dx):
+                return True
+        elif (rowa << -dx) & rowb:
+            return True
+    return False
+
+
+def maskTouchesRect(mask, mx, my, xmin, ymin, xmax, ymax):
+    """
+    Determine whether a pixel mask (see :func:`masksOverlap`) has an opaque
+    pixel inside a rectangle.
+
+    :param list mask: The mask.
+    :param int mx: The x-coordinate of the upper left corner of `mask`.
+    :param int my: The y-coordinate of the upper left corner of `mask`.
+    :param float xmin: Left edge of the rectangle.
+    :param float ymin: Top edge of the rectangle.
+    :param float xmax: Right edge of the rectangle.
+    :param float ymax: Bottom edge of the rectangle.
+    :rtype: boolean
+    :returns: `True` if an opaque pixel lies at least partly in the rectangle.
+    """
+    x0 = max(0, math.floor(xmin - mx))
+    x1 = math.ceil(xmax - mx)
+    if x1 <= x0:
+        return False
+    bits = ((1 << (x1 - x0)) - 1) << x0
+    for y in range(max(0, math.floor(ymin - my)), min(len(mask), math.ceil(ymax - my))):
+        if mask[y] & bits:
+            return True
+    return False
+
+
+def segmentBoxEntry(p0, p1, xmin, ymin, xmax, ymax):
+    """
+    Find where a line segment first enters an axis-aligned box, using the
+    slab method.
+
+    :param tuple(float,float) p0: The (x, y) start of the segment.
+    :param tuple(float,float) p1: The (x, y) end of the segment.
+    :param float xmin: Left edge of the box.
+    :param float ymin: Top edge of the box.
+    :param float xmax: Right edge of the box.
+    :param float ymax: Bottom edge of the box.
+    :rtype: float
+    :returns: The fraction (0.0 to 1.0) of the way from `p0` to `p1` at which
+        the segment enters the box, 0.0 if `p0` is inside the box, or `None`
+        if the segment misses the box.
+    """
+    tmin = 0.0
+    tmax = 1.0
+    for start, delta, lo, hi in (
+        (p0[0], p1[0] - p0[0], xmin, xmax),
+        (p0[1], p1[1] - p0[1], ymin, ymax),
+    ):
+        if delta == 0:
+            if start < lo or start > hi:
+                return None
+            continue
+        t0 = (lo - start) / delta
+        t1 = (hi - start) / delta
+        if t0 > t1:
+            t0, t1 = t1, t0
+        tmin = max(tmin, t0)
+        tmax = min(tmax, t1)
+        if tmin > tmax:
+            return None
+    return tmin
+
+
+def segmentCircleEntry(p0, p1, center, radius):
+    """
+    Find where a line segment first enters a circle.
+
+    :param tuple(float,float) p0: The (x, y) start of the segment.
+    :param tuple(float,float) p1: The (x, y) end of the segment.
+    :param tuple(float,float) center: The (x, y) circle center.
+    :param float radius: The circle radius.
+    :rtype: float
+    :returns: The fraction (0.0 to 1.0) of the way from `p0` to `p1` at which
+        the segment enters the circle, 0.0 if `p0` is inside the circle, or
+        `None` if the segment misses the circle.
+    """
+    fx = p0[0] - center[0]
+    fy = p0[1] - center[1]
+    c = fx * fx + fy * fy - radius * radius
+    if c <= 0:
+        return 0.0
+    dx = p1[0] - p0[0]
+    dy = p1[1] - p0[1]
+    a = dx * dx + dy * dy
+    b = fx * dx + fy * dy
+    disc = b * b - a * c
+    if a == 0 or b >= 0 or disc < 0:
+        return None
+    t = (-b - math.sqrt(disc)) / a
+    return t if t <= 1.0 else None
+
+
+def segmentPolygonEntry(p0, p1, vertices):
+    """
+    Find where a line segment first crosses the boundary of a polygon. The
+    polygon need not be convex, and may be degenerate (a single edge).
+
+    :param tuple(float,float) p0: The (x, y) start of the segment.
+    :param tuple(float,float) p1: The (x, y) end of the segment.
+    :param list vertices: Polygon vertices as (x, y) tuples.
+    :rtype: float
+    :returns: The fraction (0.0 to 1.0) of the way from `p0` to `p1` at which
+        the segment enters the polygon, 0.0 if `p0` is inside the polygon, or
+        `None` if the segment misses the polygon.
+    """
+    if len(vertices) > 2 and pointInPolygon(p0, vertices):
+        return 0.0
+    dx = p1[0] - p0[0]
+    dy = p1[1] - p0[1]
+    best = None
+    q0 = vertices[-1]
+    for q1 in vertices:
+        ex = q1[0] - q0[0]
+        ey = q1[1] - q0[1]
+        denom = dx * ey - dy * ex
+        if denom != 0:
+            wx = q0[0] - p0[0]
+            wy = q0[1] - p0[1]
+            t = (wx * ey - wy * ex) / denom
+            u = (wx * dy - wy * dx) / denom
+            if 0.0 <= t <= 1.0 and 0.0 <= u <= 1.0 and (best is None or t < best):
+                best = t
+        q0 = q1
+    return best
@@ -50,16 +50,16 @@ if module_exists("PIL"):
 
     class _Container(object):
         def __init__(self):
-            self.things = []
+            self.things = {}
 
         def destroy(self):
             del self.things
 
         def addChild(self, obj):
-            self.things.append(obj)
+            self.things[obj] = None
 
         def removeChild(self, obj):
-            self.things.remove(obj)
+            self.things.pop(obj, None)
 
     class getBoundingClientRect(object):
         left = 0
@@ -174,7 +174,23 @@ if module_exists("PIL"):
 
     GFX_Texture_fromImage = _Texture
 
+    _maskdigits = bytes(b"01"[a > 127] for a in range(256))
+
+    def GFX_Mask(texture):
+        # one int per row of the texture frame, bit x set if pixel x is opaque
+        f = texture.framerect
+        if texture.img is None or not f.width or not f.height:
+            return None
+        img = texture.img.convert("RGBA").crop(
+            (f.x, f.y, f.x + f.width, f.y + f.height)
+        )
+        w, h = img.size
+        digits = img.getchannel("A").tobytes().translate(_maskdigits)
+        return [int(digits[y * w : (y + 1) * w][::-1], 2) for y in range(h)]
+
     class vector(object):
+        __slots__ = ("x", "y")
+
         def __init__(self, x, y):
             self.x = x
             self.y = y
@@ -196,6 +212,17 @@ if module_exists("PIL"):
                 raise KeyError
 
     class GFX_Sprite(object):
+        __slots__ = (
+            "texture",
+            "visible",
+            "pos",
+            "anch",
+            "scal",
+            "width",
+            "height",
+            "rotation",
+        )
+
         def __init__(self, texture):
             self.texture = texture
             self.visible = True
@@ -439,6 +466,7 @@ if module_exists("PIL"):
             self.renderer = GFX.autoDetectRenderer(width, height, {"transparent": True})
             self._w.document.body.appendChild(self.renderer.view)
             self._w.onunload = onclose
+            self._geometry = None
 
         def bind(self, evtspec, callback):
             self._w.document.body.bind(evtspec, callback)
@@ -453,9 +481,22 @@ if module_exists("PIL"):
             self._stage.removeChild(obj)
 
         def animate(self, stepcallback):
+            self._geometry = None
             self.renderer.render(self._stage)
             self._w.requestAnimationFrame(stepcallback)
 
+        def geometry(self):
+            # canvas position and scale, measured once per frame
+            if self._geometry is None:
+                rect = self.renderer.view.getBoundingClientRect()
+                self._geometry = (
+                    rect.left,
+                    rect.top,
+                    self.width / rect.width,
+                    self.height / rect.height,
+                )
+            return self._geometry
+
         def destroy(self):
             SND.all().stop()
             self._stage.destroy()
@@ -71,5 +71,9 @@ class Label(_MathVisual):
             and ppos[1] <= _ppos[1] + self._sstdinputs.size
         )
 
+    def physicalExtents(self):
+        x, y = self._spposinputs.pos
+        return x, y, x + self._sstdinputs.width, y + self._sstdinputs.size
+
     def translate(self, pdisp):
         pass
@@ -13,12 +13,16 @@ from abc import ABCMeta, abstractmethod
 from time import time
 from math import sqrt
 from collections import namedtuple
+from operator import methodcaller
 from ggame.sprite import Sprite
 from ggame.asset import Color, LineStyle, ImageAsset
 from ggame.app import App
+from ggame.spatial import QuadTree
 
+_physicalextents = methodcaller("physicalExtents")
 
-class MathApp(App):
+
+class MathApp(App):  # pylint: disable=too-many-public-methods
     """
     MathApp is a subclass of the ggame :class:`~ggame.app.App` class. It
     incorporates the following extensions:
@@ -43,6 +47,10 @@ class MathApp(App):
     _mathMovableList = []
     _mathSelectableList = []
     _mathStrokableList = []
+    # hit-testing indexes over the physical extents of the objects above
+    _mathMovableIndex = QuadTree(_physicalextents)
+    _mathSelectableIndex = QuadTree(_physicalextents)
+    _mathStrokableIndex = QuadTree(_physicalextents)
     _viewNotificationList = []
     time = 0
 
@@ -192,9 +200,13 @@ class MathApp(App):
         except AttributeError:
             return pp
 
+    @staticmethod
+    def _hitCandidates(index, event):
+        return index.query(event.x, event.y, event.x, event.y)
+
     def _handleMouseClick(self, event):
         found = False
-        for obj in self._mathSelectableList:
+        for obj in self._hitCandidates(self._mathSelectableIndex, event):
             if obj.physicalPointTouching((event.x, event.y)):
                 found = True
                 if not obj.selected:
@@ -208,19 +220,19 @@ class MathApp(App):
         self._mousedown = True
         self._mouse_captured_object = None
         self._mouse_stroked_object = None
-        for obj in self._mathSelectableList:
+        for obj in self._hitCandidates(self._mathSelectableIndex, event):
             if obj.physicalPointTouching((event.x, event.y)):
                 obj.mousedown()
                 self._mouse_down_object = obj
                 break
-        for obj in self._mathMovableList:
+        for obj in self._hitCandidates(self._mathMovableIndex, event):
             if obj.physicalPointTouching((event.x, event.y)) and not (
                 obj.strokable and obj.canstroke((event.x, event.y))
             ):
                 self._mouse_captured_object = obj
                 break
         if not self._mouse_captured_object:
-            for obj in self._mathStrokableList:
+            for obj in self._hitCandidates(self._mathStrokableIndex, event):
                 if obj.canstroke((event.x, event.y)):
                     self._mouse_stroked_object = obj
                     break
@@ -376,6 +388,7 @@ class MathApp(App):
         """
         if isinstance(obj, _MathVisual) and obj not in cls._mathMovableList:
             cls._mathMovableList.append(obj)
+            cls._mathMovableIndex.insert(obj)
 
     @classmethod
     def removeMovable(cls, obj):
@@ -387,6 +400,7 @@ class MathApp(App):
         """
         if isinstance(obj, _MathVisual) and obj in cls._mathMovableList:
             cls._mathMovableList.remove(obj)
+            cls._mathMovableIndex.remove(obj)
 
     @classmethod
     def addSelectable(cls, obj):
@@ -398,6 +412,7 @@ class MathApp(App):
         """
         if isinstance(obj, _MathVisual) and obj not in cls._mathSelectableList:
             cls._mathSelectableList.append(obj)
+            cls._mathSelectableIndex.insert(obj)
 
     @classmethod
     def removeSelectable(cls, obj):
@@ -409,6 +424,7 @@ class MathApp(App):
         """
         if isinstance(obj, _MathVisual) and obj in cls._mathSelectableList:
             cls._mathSelectableList.remove(obj)
+            cls._mathSelectableIndex.remove(obj)
 
     @classmethod
     def addStrokable(cls, obj):
@@ -420,6 +436,7 @@ class MathApp(App):
         """
         if isinstance(obj, _MathVisual) and obj not in cls._mathStrokableList:
             cls._mathStrokableList.append(obj)
+            cls._mathStrokableIndex.insert(obj)
 
     @classmethod
     def removeStrokable(cls, obj):
@@ -431,6 +448,22 @@ class MathApp(App):
         """
         if isinstance(obj, _MathVisual) and obj in cls._mathStrokableList:
             cls._mathStrokableList.remove(obj)
+            cls._mathStrokableIndex.remove(obj)
+
+    @classmethod
+    def invalidateHitExtents(cls, obj):
+        """
+        Flag a movable, selectable or strokable object whose physical extents
+        have changed, so that mouse events are tested against its new extents.
+        This is called automatically when an object is moved or its asset is
+        rebuilt.
+
+        :param object obj: The object whose extents have changed
+        :returns: None
+        """
+        cls._mathMovableIndex.invalidate(obj)
+        cls._mathSelectableIndex.invalidate(obj)
+        cls._mathStrokableIndex.invalidate(obj)
 
     @classmethod
     def destroy(cls):
@@ -444,6 +477,9 @@ class MathApp(App):
         MathApp._mathMovableList = []
         MathApp._mathSelectableList = []
         MathApp._mathStrokableList = []
+        MathApp._mathMovableIndex = QuadTree(_physicalextents)
+        MathApp._mathSelectableIndex = QuadTree(_physicalextents)
+        MathApp._mathStrokableIndex = QuadTree(_physicalextents)
         MathApp._viewNotificationList = []
 
 
@@ -613,6 +649,7 @@ class _MathVisual(Sprite, _MathDynamic, metaclass=ABCMeta):
     def destroy(self):
         MathApp.removeVisual(self)
         MathApp.removeMovable(self)
+        MathApp.removeSelectable(self)
         MathApp.removeStrokable(self)
         _MathDynamic.destroy(self)
         Sprite.destroy(self)
@@ -623,6 +660,7 @@ class _MathVisual(Sprite, _MathDynamic, metaclass=ABCMeta):
             if MathApp.win is not None:
                 MathApp.win.remove(self.gfx)
                 self.gfx.destroy()
+            self._releaseTexture()
             self.asset = asset
             self.gfx = self.asset.gfx
             self.gfx.visible = visible
@@ -795,6 +833,39 @@ class _MathVisual(Sprite, _MathDynamic, metaclass=ABCMeta):
             self._saveInputs(inputs)
         if changed or force:
             self._updateAsset(self._buildAsset())
+            MathApp.invalidateHitExtents(self)
+
+    def _setExtentsDirty(self):
+        super()._setExtentsDirty()
+        MathApp.invalidateHitExtents(self)
+
+    # moving the sprite shifts its extents without marking them dirty
+    @Sprite.x.setter
+    def x(self, value):
+        Sprite.x.fset(self, value)
+        MathApp.invalidateHitExtents(self)
+
+    @Sprite.y.setter
+    def y(self, value):
+        Sprite.y.fset(self, value)
+        MathApp.invalidateHitExtents(self)
+
+    def physicalExtents(self):
+        """
+        Return a rectangle, in physical screen coordinates, that encloses
+        every point at which :func:`physicalPointTouching` or
+        :func:`canstroke` could return True. MathApp uses this to find the
+        objects near the mouse without testing every object.
+
+        :rtype: tuple(float,float,float,float)
+        :returns: The (xmin, ymin, xmax, ymax) extents of the object.
+
+        The default implementation returns the extents of the sprite. This
+        method should be overridden by any class whose touchable region
+        differs from its sprite.
+        """
+        self.setExtents()
+        return self.xmin, self.ymin, self.xmax, self.ymax
 
     @abstractmethod
     def _buildAsset(self):
@@ -44,6 +44,18 @@ class _Point(_MathVisual, metaclass=ABCMeta):
             < self._sstdinputs.size
         )
 
+    def physicalExtents(self):
+        """
+        Return the physical extents of the region that is considered to be
+        touching this point.
+
+        :rtype: tuple(float,float,float,float)
+        :returns: The (xmin, ymin, xmax, ymax) extents of the point.
+        """
+        x, y = self._pposinputs.pos  # pylint: disable=no-member
+        size = self._sstdinputs.size
+        return x - size, y - size, x + size, y + size
+
     def translate(self, pdisp):
         """
         Perform necessary processing in response to being moved by the mouse/UI.
@@ -164,3 +176,12 @@ class ImagePoint(_Point):
         self.setExtents()  # ensure xmin, xmax are correct
         x, y = ppos
         return self.xmax >= x >= self.xmin and self.ymax >= y >= self.ymin
+
+    def physicalExtents(self):
+        """
+        Return the physical extents of the point's image.
+
+        :rtype: tuple(float,float,float,float)
+        :returns: The (xmin, ymin, xmax, ymax) extents of the image.
+        """
+        return _MathVisual.physicalExtents(self)
@@ -103,7 +103,7 @@ if module_exists("pygame"):
         @classmethod
         def fromTexture(cls, texture, frame):
             inst = cls()
-            inst.img = pygame.Surface((frame.width, frame.height))
+            inst.img = pygame.Surface((frame.width, frame.height), pygame.SRCALPHA)
             inst.img.blit(texture.img, (0, 0), frame)
             inst.name = texture.name
             inst.basewidth = texture.basewidth
@@ -134,7 +134,17 @@ if module_exists("pygame"):
 
     GFX_Texture_fromImage = _Texture
 
+    def GFX_Mask(texture):
+        # one int per row of the texture, bit x set if pixel x is opaque
+        mask = pygame.mask.from_surface(texture.img)
+        w, h = mask.get_size()
+        if not w or not h:
+            return None
+        return [sum(1 << x for x in range(w) if mask.get_at((x, y))) for y in range(h)]
+
     class vector(object):
+        __slots__ = ("x", "y")
+
         def __init__(self, x, y):
             self.x = x
             self.y = y
@@ -156,6 +166,18 @@ if module_exists("pygame"):
                 raise KeyError
 
     class GFX_Sprite(object):
+        __slots__ = (
+            "basetexture",
+            "texture",
+            "visible",
+            "pos",
+            "anch",
+            "scal",
+            "width",
+            "height",
+            "rotation",
+        )
+
         def __init__(self, texture):
             self.basetexture = texture
             self.texture = self.basetexture
@@ -464,7 +486,7 @@ if module_exists("pygame"):
             pygame.init()
             self._w = pygame.display.set_mode((width, height))
             self.clock = pygame.time.Clock()
-            self.sprites = []
+            self.sprites = {}  # insertion ordered, for O(1) removal
             self.animatestarted = False
             self.bindings = {}
             self.onclose = onclose
@@ -482,12 +504,16 @@ if module_exists("pygame"):
         def bind(self, evtspec, callback):
             self.bindings[evtspec] = callback
 
+        def geometry(self):
+            # mouse positions are already in window pixels
+            return (0, 0, 1, 1)
+
         def add(self, obj):
-            self.sprites.append(obj)
+            self.sprites[obj] = None
             # self._stage.addChild(obj)
 
         def remove(self, obj):
-            self.sprites.remove(obj)
+            self.sprites.pop(obj, None)
             # self._stage.removeChild(obj)
 
         def animate(self, stepcallback):
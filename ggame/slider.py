@@ -223,6 +223,11 @@ class Slider(_MathVisual):
             and ppos[1] <= _ppos[1] + self._sstdinputs.size
         )
 
+    def physicalExtents(self):
+        x, y = self._spposinputs.pos
+        # the thumb may overhang the right end of the slider by two pixels
+        return x, y, x + self._sstdinputs.width + 2, y + self._sstdinputs.size
+
     def physicalPointTouchingThumb(self, ppos):
         """
         Determine if a physical screen location is touching the slider "thumb".
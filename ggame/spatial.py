@@ -0,0 +1,657 @@
+"""
+Spatial indexing structures used by ggame to accelerate collision queries
+between large numbers of :class:`~ggame.sprite.Sprite` objects.
+
+These structures operate on any object that exposes `xmin`, `xmax`, `ymin`
+and `ymax` extents attributes (as :class:`~ggame.sprite.Sprite` does) and are
+normally managed by the :class:`~ggame.app.App` class rather than used
+directly.
+"""
+import math
+from ggame.geometry import segmentBoxEntry
+
+
+class SpatialHash:
+    """
+    A uniform grid that buckets objects by the cells their extents overlap.
+    Queries only need to examine objects sharing at least one cell with
+    the query rectangle, rather than every object in the application.
+
+    Objects whose extents are known to be out of date may be flagged with
+    :meth:`invalidate`. They are refreshed (by calling their `setExtents`
+    method) before the next query.
+
+    :param int cellsize: The width and height of each grid cell, in pixels.
+        A good choice is roughly the size of a typical sprite.
+    """
+
+    def __init__(self, cellsize=64):
+        self.cellsize = cellsize
+        self._cells = {}
+        self._objcells = {}
+        self._pending = set()
+
+    def __len__(self):
+        return len(self._objcells)
+
+    def __contains__(self, obj):
+        return obj in self._objcells
+
+    def _cellrange(self, obj):
+        cs = self.cellsize
+        return (
+            int(obj.xmin // cs),
+            int(obj.ymin // cs),
+            int(obj.xmax // cs),
+            int(obj.ymax // cs),
+        )
+
+    def _unlink(self, obj, crange):
+        cells = self._cells
+        for cx in range(crange[0], crange[2] + 1):
+            for cy in range(crange[1], crange[3] + 1):
+                bucket = cells[(cx, cy)]
+                bucket.discard(obj)
+                if not bucket:
+                    del cells[(cx, cy)]
+
+    def _link(self, obj, crange):
+        cells = self._cells
+        for cx in range(crange[0], crange[2] + 1):
+            for cy in range(crange[1], crange[3] + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = bucket = set()
+                bucket.add(obj)
+
+    def insert(self, obj):
+        """
+        Insert an object into the grid according to its current extents. If
+        the object is already present, it is moved as with :meth:`move`.
+
+        :param object obj: The object (typically a Sprite) to insert.
+        :returns: None
+        """
+        self._pending.discard(obj)
+        crange = self._cellrange(obj)
+        old = self._objcells.get(obj)
+        if old == crange:
+            return
+        if old is not None:
+            self._unlink(obj, old)
+        self._link(obj, crange)
+        self._objcells[obj] = crange
+
+    def move(self, obj):
+        """
+        Move an object to the cells that correspond to its current extents.
+        Objects that have not crossed a cell boundary are not touched, and
+        objects that are not in the grid are ignored.
+
+        :param object obj: The object to move.
+        :returns: None
+        """
+        if obj in self._objcells:
+            self.insert(obj)
+
+    def remove(self, obj):
+        """
+        Remove an object from the grid. Removing an object that is not
+        present has no effect.
+
+        :param object obj: The object to remove.
+        :returns: None
+        """
+        self._pending.discard(obj)
+        old = self._objcells.pop(obj, None)
+        if old is not None:
+            self._unlink(obj, old)
+
+    def invalidate(self, obj):
+        """
+        Flag an object whose extents must be recalculated before it can be
+        placed correctly in the grid.
+
+        :param object obj: The object to flag.
+        :returns: None
+        """
+        if obj in self._objcells:
+            self._pending.add(obj)
+
+    def refresh(self):
+        """
+        Recalculate extents for all objects flagged with :meth:`invalidate`
+        and move them to their correct cells.
+
+        :returns: None
+        """
+        while self._pending:
+            obj = self._pending.pop()
+            obj.setExtents()
+            self.move(obj)
+
+    def query(self, xmin, ymin, xmax, ymax):
+        """
+        Find all objects that share a grid cell with a rectangle. The result
+        is a superset of the objects whose extents overlap the rectangle.
+
+        :param float xmin: Left edge of the query rectangle.
+        :param float ymin: Top edge of the query rectangle.
+        :param float xmax: Right edge of the query rectangle.
+        :param float ymax: Bottom edge of the query rectangle.
+        :rtype: set
+        :returns: A (potentially empty) set of candidate objects.
+        """
+        self.refresh()
+        cs = self.cellsize
+        cells = self._cells
+        found = set()
+        for cx in range(int(xmin // cs), int(xmax // cs) + 1):
+            for cy in range(int(ymin // cs), int(ymax // cs) + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    found.update(bucket)
+        return found
+
+    def querySegment(self, x0, y0, x1, y1):
+        """
+        Find all objects that share a grid cell with a line segment. Only
+        the cells that the segment passes through are examined, so the cost
+        depends on the length of the segment rather than the number of
+        objects. The result is a superset of the objects whose extents the
+        segment crosses.
+
+        :param float x0: The x-coordinate of the start of the segment.
+        :param float y0: The y-coordinate of the start of the segment.
+        :param float x1: The x-coordinate of the end of the segment.
+        :param float y1: The y-coordinate of the end of the segment.
+        :rtype: set
+        :returns: A (potentially empty) set of candidate objects.
+        """
+        self.refresh()
+        cs = self.cellsize
+        cells = self._cells
+        cx, cy = int(x0 // cs), int(y0 // cs)
+        ex, ey = int(x1 // cs), int(y1 // cs)
+        # step from cell to cell, crossing whichever boundary comes first
+        stepx, tnextx, tdeltax = _traversal(x0, x1, cx, cs)
+        stepy, tnexty, tdeltay = _traversal(y0, y1, cy, cs)
+        found = set()
+        for _ in range(abs(ex - cx) + abs(ey - cy) + 1):
+            bucket = cells.get((cx, cy))
+            if bucket:
+                found.update(bucket)
+            if cy == ey or (cx != ex and tnextx < tnexty):
+                cx += stepx
+                tnextx += tdeltax
+            else:
+                cy += stepy
+                tnexty += tdeltay
+        return found
+
+
+class SweepAndPrune:
+    """
+    A sort-and-sweep broad phase that finds every pair of objects whose
+    extents overlap. Objects are kept in a list ordered by `xmin` that
+    persists between sweeps. Because objects usually move only a little
+    from one frame to the next, the list is nearly sorted at the start of
+    each sweep and re-sorting it costs close to linear time.
+    """
+
+    def __init__(self):
+        self._objects = []
+        self._members = set()
+        # removed objects that have not yet been purged from the list
+        self._stale = set()
+
+    def __len__(self):
+        return len(self._members)
+
+    def __contains__(self, obj):
+        return obj in self._members
+
+    def __iter__(self):
+        # in order of xmin as of the last sweep
+        members = self._members
+        return (obj for obj in self._objects if obj in members)
+
+    def insert(self, obj):
+        """
+        Add an object to the sweep. Adding an object that is already present
+        has no effect.
+
+        :param object obj: The object (typically a Sprite) to add.
+        :returns: None
+        """
+        if obj not in self._members:
+            self._members.add(obj)
+            if obj in self._stale:
+                self._stale.discard(obj)
+            else:
+                self._objects.append(obj)
+
+    def remove(self, obj):
+        """
+        Remove an object from the sweep. Removing an object that is not
+        present has no effect.
+
+        :param object obj: The object to remove.
+        :returns: None
+        """
+        if obj in self._members:
+            self._members.discard(obj)
+            self._stale.add(obj)
+
+    def pairs(self):
+        """
+        Find all pairs of objects whose extents overlap. Each pair is
+        reported only once. Extents of every object are refreshed (by calling
+        its `setExtents` method) before sorting.
+
+        :rtype: list
+        :returns: A (potentially empty) list of object tuples.
+        """
+        objs = self._objects
+        if self._stale:
+            members = self._members
+            objs[:] = [obj for obj in objs if obj in members]
+            self._stale.clear()
+        for obj in objs:
+            obj.setExtents()
+        # Timsort finds the runs left in place since the last sweep, so
+        # re-sorting a nearly sorted list is close to linear.
+        objs.sort(key=_xminkey)
+        found = []
+        count = len(objs)
+        for i in range(count):
+            a = objs[i]
+            axmax = a.xmax
+            aymin = a.ymin
+            aymax = a.ymax
+            for j in range(i + 1, count):
+                b = objs[j]
+                if b.xmin > axmax:
+                    break
+                if b.ymin <= aymax and b.ymax >= aymin:
+                    found.append((a, b))
+        return found
+
+
+class QuadTree:
+    """
+    A region quadtree that stores each object in the smallest node that
+    wholly contains its extents. Crowded nodes split into four quadrants, so
+    dense clusters of small objects are subdivided finely while empty space
+    costs nothing, whatever the scale of the coordinates. The root grows
+    automatically to take in objects outside its current region.
+
+    Objects whose extents are known to be out of date may be flagged with
+    :meth:`invalidate`. Their extents are read again before the next query.
+
+    :param function extents: Optional function that accepts an object and
+        returns its (xmin, ymin, xmax, ymax) extents. By default, the `xmin`,
+        `ymin`, `xmax` and `ymax` attributes of the object are used.
+
+    :param int capacity: The number of objects a node may hold before it is
+        split into quadrants.
+    """
+
+    _MINSIZE = 1
+
+    def __init__(self, extents=None, capacity=8):
+        self.extents = extents or _objextents
+        self.capacity = capacity
+        self._root = _QuadNode(0, 0, 1024)
+        self._objnodes = {}
+        self._order = {}
+        self._serial = 0
+        self._pending = set()
+
+    def __len__(self):
+        return len(self._objnodes)
+
+    def __contains__(self, obj):
+        return obj in self._objnodes
+
+    def _grow(self, box):
+        # double the root towards the box until the box fits inside it
+        root = self._root
+        while not root.contains(box):
+            size = root.size
+            left = box[0] < root.x
+            up = box[1] < root.y
+            newroot = _QuadNode(
+                root.x - size if left else root.x,
+                root.y - size if up else root.y,
+                size * 2,
+            )
+            newroot.split()
+            newroot.children[2 * up + left] = root
+            root = newroot
+        self._root = root
+
+    def _place(self, obj, box):
+        node = self._root
+        while node.children is not None:
+            child = node.childFor(box)
+            if child is None:
+                break
+            node = child
+        node.items[obj] = box
+        self._objnodes[obj] = node
+        if (
+            node.children is None
+            and len(node.items) > self.capacity
+            and node.size > self._MINSIZE
+        ):
+            node.split()
+            for item, itembox in list(node.items.items()):
+                child = node.childFor(itembox)
+                if child is not None:
+                    del node.items[item]
+                    child.items[item] = itembox
+                    self._objnodes[item] = child
+
+    def insert(self, obj):
+        """
+        Insert an object into the tree according to its current extents. If
+        the object is already present, it is moved as with :meth:`move`.
+
+        :param object obj: The object to insert.
+        :returns: None
+        """
+        self._pending.discard(obj)
+        box = tuple(self.extents(obj))
+        if not all(map(math.isfinite, box)):
+            raise ValueError("QuadTree extents must be finite")
+        node = self._objnodes.get(obj)
+        if node is not None:
+            if node.items[obj] == box:
+                return
+            del node.items[obj]
+        else:
+            self._order[obj] = self._serial
+            self._serial += 1
+        self._grow(box)
+        self._place(obj, box)
+
+    def move(self, obj):
+        """
+        Move an object to the node that corresponds to its current extents.
+        Objects that are not in the tree are ignored.
+
+        :param object obj: The object to move.
+        :returns: None
+        """
+        if obj in self._objnodes:
+            self.insert(obj)
+
+    def remove(self, obj):
+        """
+        Remove an object from the tree. Removing an object that is not
+        present has no effect.
+
+        :param object obj: The object to remove.
+        :returns: None
+        """
+        self._pending.discard(obj)
+        node = self._objnodes.pop(obj, None)
+        if node is not None:
+            del node.items[obj]
+            del self._order[obj]
+
+    def invalidate(self, obj):
+        """
+        Flag an object whose extents must be read again before the next
+        query.
+
+        :param object obj: The object to flag.
+        :returns: None
+        """
+        if obj in self._objnodes:
+            self._pending.add(obj)
+
+    def refresh(self):
+        """
+        Read the extents of all objects flagged with :meth:`invalidate` and
+        move them to their correct nodes.
+
+        :returns: None
+        """
+        while self._pending:
+            self.move(self._pending.pop())
+
+    def query(self, xmin, ymin, xmax, ymax):
+        """
+        Find all objects whose extents overlap a rectangle. Pass the same
+        point twice to find the objects whose extents contain that point.
+
+        :param float xmin: Left edge of the query rectangle.
+        :param float ymin: Top edge of the query rectangle.
+        :param float xmax: Right edge of the query rectangle.
+        :param float ymax: Bottom edge of the query rectangle.
+        :rtype: list
+        :returns: A (potentially empty) list of objects, in the order that
+            they were inserted.
+        """
+        self.refresh()
+        found = []
+        nodes = [self._root]
+        while nodes:
+            node = nodes.pop()
+            for obj, box in node.items.items():
+                if (
+                    box[0] <= xmax
+                    and box[2] >= xmin
+                    and box[1] <= ymax
+                    and box[3] >= ymin
+                ):
+                    found.append(obj)
+            if node.children is not None:
+                for child in node.children:
+                    if (
+                        child.x <= xmax
+                        and child.x + child.size >= xmin
+                        and child.y <= ymax
+                        and child.y + child.size >= ymin
+                    ):
+                        nodes.append(child)
+        found.sort(key=self._order.__getitem__)
+        return found
+
+
+class _QuadNode:
+    """
+    One square node of a :class:`QuadTree`. Children are ordered top-left,
+    top-right, bottom-left, bottom-right.
+    """
+
+    __slots__ = ["x", "y", "size", "items", "children"]
+
+    def __init__(self, x, y, size):
+        self.x = x
+        self.y = y
+        self.size = size
+        self.items = {}
+        self.children = None
+
+    def contains(self, box):
+        """
+        Determine whether extents lie entirely within the node.
+        """
+        return (
+            self.x <= box[0]
+            and box[2] < self.x + self.size
+            and self.y <= box[1]
+            and box[3] < self.y + self.size
+        )
+
+    def split(self):
+        """
+        Create the four (empty) quadrants of the node.
+        """
+        half = self.size / 2
+        x, y = self.x, self.y
+        self.children = [
+            _QuadNode(x, y, half),
+            _QuadNode(x + half, y, half),
+            _QuadNode(x, y + half, half),
+            _QuadNode(x + half, y + half, half),
+        ]
+
+    def childFor(self, box):
+        """
+        Find the quadrant that entirely contains extents, or None.
+        """
+        half = self.size / 2
+        midx = self.x + half
+        midy = self.y + half
+        if box[2] < midx:
+            col = 0
+        elif box[0] >= midx:
+            col = 1
+        else:
+            return None
+        if box[3] < midy:
+            row = 0
+        elif box[1] >= midy:
+            row = 2
+        else:
+            return None
+        return self.children[row + col]
+
+
+def _objextents(obj):
+    return obj.xmin, obj.ymin, obj.xmax, obj.ymax
+
+
+class AABBTree:
+    """
+    An immutable bounding volume hierarchy of axis-aligned boxes, suited to
+    objects that never move, such as walls and platforms. Each node of the
+    tree holds the box enclosing everything beneath it, so a query only
+    descends into the few branches that overlap the query rectangle.
+
+    The tree cannot be changed once it is built. Build a new tree when the
+    set of objects changes. Extents of every object are refreshed (by
+    calling its `setExtents` method) as the tree is built.
+
+    :param list objects: The objects to place in the tree.
+    """
+
+    _LEAFSIZE = 4
+
+    def __init__(self, objects=()):
+        # parallel lists, one entry per node: the enclosing box, the
+        # (left, right) child indexes of a branch and the objects of a leaf
+        self._boxes = []
+        self._children = []
+        self._leaves = []
+        items = []
+        for obj in objects:
+            obj.setExtents()
+            items.append((obj, (obj.xmin, obj.ymin, obj.xmax, obj.ymax)))
+        self._members = frozenset(obj for obj, _ in items)
+        if items:
+            self._build(items)
+
+    def __len__(self):
+        return len(self._members)
+
+    def __contains__(self, obj):
+        return obj in self._members
+
+    def _build(self, items):
+        index = len(self._boxes)
+        xmin = min(box[0] for _, box in items)
+        ymin = min(box[1] for _, box in items)
+        xmax = max(box[2] for _, box in items)
+        ymax = max(box[3] for _, box in items)
+        self._boxes.append((xmin, ymin, xmax, ymax))
+        if len(items) <= self._LEAFSIZE:
+            self._children.append(None)
+            self._leaves.append(items)
+            return index
+        self._children.append(None)
+        self._leaves.append(None)
+        # split at the median centre along the longer side
+        axis = 0 if xmax - xmin >= ymax - ymin else 1
+        items.sort(key=lambda item: item[1][axis] + item[1][axis + 2])
+        half = len(items) // 2
+        left = self._build(items[:half])
+        right = self._build(items[half:])
+        self._children[index] = (left, right)
+        return index
+
+    def _search(self, hit):
+        # collect objects in every leaf whose box satisfies hit(box)
+        found = []
+        if not self._boxes:
+            return found
+        boxes = self._boxes
+        children = self._children
+        leaves = self._leaves
+        nodes = [0]
+        while nodes:
+            node = nodes.pop()
+            if not hit(boxes[node]):
+                continue
+            if children[node] is None:
+                found.extend(obj for obj, box in leaves[node] if hit(box))
+            else:
+                nodes.extend(children[node])
+        return found
+
+    def query(self, xmin, ymin, xmax, ymax):
+        """
+        Find all objects whose extents overlap a rectangle.
+
+        :param float xmin: Left edge of the query rectangle.
+        :param float ymin: Top edge of the query rectangle.
+        :param float xmax: Right edge of the query rectangle.
+        :param float ymax: Bottom edge of the query rectangle.
+        :rtype: list
+        :returns: A (potentially empty) list of objects.
+        """
+
+        def overlaps(box):
+            return (
+                box[0] <= xmax and box[2] >= xmin and box[1] <= ymax and box[3] >= ymin
+            )
+
+        return self._search(overlaps)
+
+    def querySegment(self, x0, y0, x1, y1):
+        """
+        Find all objects whose extents a line segment crosses.
+
+        :param float x0: The x-coordinate of the start of the segment.
+        :param float y0: The y-coordinate of the start of the segment.
+        :param float x1: The x-coordinate of the end of the segment.
+        :param float y1: The y-coordinate of the end of the segment.
+        :rtype: list
+        :returns: A (potentially empty) list of objects.
+        """
+        p0 = (x0, y0)
+        p1 = (x1, y1)
+
+        def crosses(box):
+            return segmentBoxEntry(p0, p1, *box) is not None
+
+        return self._search(crosses)
+
+
+def _xminkey(obj):
+    return obj.xmin
+
+
+def _traversal(start, end, cell, cellsize):
+    # direction, distance to first cell boundary and distance between
+    # boundaries, as fractions of the segment length
+    delta = end - start
+    if delta > 0:
+        return 1, ((cell + 1) * cellsize - start) / delta, cellsize / delta
+    if delta < 0:
+        return -1, (cell * cellsize - start) / delta, -cellsize / delta
+    return 0, math.inf, math.inf
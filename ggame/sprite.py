@@ -1,12 +1,15 @@
+# pylint: disable=too-many-lines
 """
 Sprite class for encapsulating all visible objects in ggame applications.
 """
 import os
 import math
+from itertools import count
 from ggame.sysdeps import GFX_Sprite
 from ggame.asset import (
     RectangleAsset,
     CircleAsset,
+    CircleGroupAsset,
     ImageAsset,
     PolygonAsset,
     EllipseAsset,
@@ -14,6 +17,28 @@ from ggame.asset import (
     LineAsset,
 )
 from ggame.app import App
+from ggame.geometry import (
+    edgeNormals,
+    polygonsOverlap,
+    circleTouchesPolygon,
+    masksOverlap,
+    maskTouchesRect,
+    segmentBoxEntry,
+    segmentCircleEntry,
+    segmentPolygonEntry,
+)
+
+
+# Sprite and App cooperate closely in maintaining collision structures
+# pylint: disable=protected-access
+
+# Geometry versions are unique across all sprites, so a cached collision
+# result can never be mistaken for one found for an earlier sprite that
+# happened to have the same id.
+_versions = count(1)
+
+# Collision results are forgotten once this many are cached in one frame
+_PAIRCACHESIZE = 10000
 
 
 # pylint: disable=useless-object-inheritance
@@ -62,8 +87,58 @@ class Sprite(object):  # pylint: disable=too-many-public-methods
 
     """
 
+    # Slots keep large sprite populations compact. The __dict__ slot still
+    # allows ad hoc attributes, but is only allocated when one is set.
+    __slots__ = (
+        "_index",
+        "_dying",
+        "_forget",
+        "_version",
+        "_continuous",
+        "_static",
+        "_collisionlayer",
+        "_collisionmask",
+        "_defaultlayers",
+        "_sharedtexture",
+        "_masked",
+        "asset",
+        "gfx",
+        "edgedef",
+        "xmin",
+        "xmax",
+        "ymin",
+        "ymax",
+        "_extentsdirty",
+        "_basevertices",
+        "_localvertices",
+        "_localkey",
+        "_localbounds",
+        "_localpieces",
+        "_localcircles",
+        "_vertices",
+        "_vertexpos",
+        "_pieces",
+        "_piecepos",
+        "_circles",
+        "_circlepos",
+        "_normals",
+        "_normalskey",
+        "__dict__",
+        "__weakref__",
+    )
+
     def __init__(self, asset, pos=(0, 0), edgedef=None):
         self._index = 0
+        self._dying = False
+        self._forget = None
+        self._version = next(_versions)
+        self._continuous = False
+        self._static = False
+        self._collisionlayer = 1
+        self._collisionmask = -1
+        self._defaultlayers = True
+        # the asset whose shared texture this sprite holds, if any
+        self._sharedtexture = None
         if isinstance(asset, ImageAsset):
             self.asset = asset
             try:
@@ -75,7 +150,9 @@ class Sprite(object):  # pylint: disable=too-many-public-methods
             asset, (RectangleAsset, CircleAsset, EllipseAsset, PolygonAsset, LineAsset)
         ):
             self.asset = asset
-            self.gfx = GFX_Sprite(asset.gfx.generateTexture())
+            # all sprites using the asset share one generated texture
+            self.gfx = GFX_Sprite(asset._acquireTexture())
+            self._sharedtexture = asset
         elif isinstance(asset, TextAsset):
             self.asset = asset.clone()
             self.gfx = self.asset.gfx  # gfx is PIXI Text (from Sprite)
@@ -84,68 +161,187 @@ class Sprite(object):  # pylint: disable=too-many-public-methods
             self.edgedef = asset
         else:
             self.edgedef = edgedef
+        # only image sprites that use their own image as a boundary have masks
+        self._masked = bool(
+            self.edgedef is asset and isinstance(asset, ImageAsset) and asset.pixelmask
+        )
         self.xmin = self.xmax = self.ymin = self.ymax = 0
-        self.position = pos
-        """Tuple indicates the position of the sprite on the screen."""
         self._extentsdirty = True
         """Boolean indicates if extents must be calculated before collision test"""
+        self.position = pos
+        """Tuple indicates the position of the sprite on the screen."""
         self._createBaseVertices()
-        self._absolutevertices = None
+        self._localvertices = None
+        self._localkey = None
+        self._localbounds = None
+        self._localpieces = None
+        self._localcircles = None
+        self._vertices = None
+        self._vertexpos = None
+        self._pieces = None
+        self._piecepos = None
+        self._circles = None
+        self._circlepos = None
+        self._normals = None
+        self._normalskey = None
         self.setExtents()
         App.add(self)
 
     def _createBaseVertices(self):
         """
-        Create sprite-relative list of vertex coordinates for boundary
+        Use the sprite-relative boundary vertices shared by the edge asset
         """
-        self._basevertices = []
-        assettype = type(self.edgedef)
-        if assettype in [RectangleAsset, ImageAsset, TextAsset]:
-            self._basevertices = [
-                (0, 0),
-                (0, self.edgedef.height),
-                (self.edgedef.width, self.edgedef.height),
-                (self.edgedef.width, 0),
-            ]
-        elif assettype in [PolygonAsset, LineAsset]:
-            if assettype is PolygonAsset:
-                self._basevertices = self.edgedef.path[:-1]
-            elif assettype is LineAsset:
-                self._basevertices = [
-                    (0, 0),
-                    (self.edgedef.delta_x, self.edgedef.delta_y),
-                ]
-            xpoints, ypoints = zip(*self._basevertices)
-            xmin = min(xpoints)
-            ymin = min(ypoints)
-            xpoints = [x - xmin for x in xpoints]
-            ypoints = [y - ymin for y in ypoints]
-            self._basevertices = list(zip(xpoints, ypoints))
-        elif assettype is EllipseAsset:
-            w = self.edgedef.halfw * 2
-            h = self.edgedef.halfh * 2
-            self._basevertices = [(0, 0), (0, h), (w, h), (w, 0)]
+        # the convex hull has the same extents, and is what the separating
+        # axis test requires
+        self._basevertices = self.edgedef._hullvertices
 
     def _xformVertices(self):
         """
         Create window-relative list of vertex coordinates for boundary
         """
+        key = (
+            self.rotation,
+            self.scale,
+            self.fxcenter,
+            self.fycenter,
+            self.width,
+            self.height,
+        )
+        if key != self._localkey:
+            # sprites sharing an edge asset and transform share one shape
+            cache = self.edgedef._shapecache
+            shape = cache.get(key)
+            if shape is None:
+                shape = (key,) + self._localShape()
+                if len(cache) >= 64:
+                    cache.clear()
+                cache[key] = shape
+            (
+                self._localkey,
+                self._localvertices,
+                self._localbounds,
+                self._localpieces,
+                self._localcircles,
+            ) = shape
+        # absolute coordinates are built on demand, from the shape and position
+        self._vertexpos = None
+        self._piecepos = None
+        self._circlepos = None
+
+    def _localShape(self):
+        """
+        Create position-relative vertex coordinates for boundary, its bounds,
+        the convex pieces of a concave boundary and the circles of a circle
+        group boundary
+        """
         # find center as sprite-relative points (note sprite may be scaled)
         x = self.width * self.fxcenter / self.scale
         y = self.height * self.fycenter / self.scale
-        if self.scale != 1.0:
-            sc = self.scale
-            # center-relative, scaled coordinates
-            crsc = [((xp - x) * sc, (yp - y) * sc) for xp, yp in self._basevertices]
-        else:
-            crsc = [(xp - x, yp - y) for xp, yp in self._basevertices]
-
-        # absolute, rotated coordinates
+        sc = self.scale
         c = math.cos(self.rotation)
         s = math.sin(self.rotation)
-        self._absolutevertices = [
-            (self.x + x * c + y * s, self.y + -x * s + y * c) for x, y in crsc
-        ]
+
+        def place(points):
+            if sc != 1.0:
+                # center-relative, scaled coordinates
+                crsc = [((xp - x) * sc, (yp - y) * sc) for xp, yp in points]
+            else:
+                crsc = [(xp - x, yp - y) for xp, yp in points]
+            # position-relative, rotated coordinates
+            return tuple((u * c + v * s, -u * s + v * c) for u, v in crsc)
+
+        local = place(self._basevertices)
+        if isinstance(self.edgedef, CircleGroupAsset):
+            centers = place([center for center, _ in self.edgedef.circles])
+            circles = tuple(
+                (center, r * sc)
+                for center, (_, r) in zip(centers, self.edgedef.circles)
+            )
+            bounds = (
+                min(cx - r for (cx, _), r in circles),
+                min(cy - r for (_, cy), r in circles),
+                max(cx + r for (cx, _), r in circles),
+                max(cy + r for (_, cy), r in circles),
+            )
+            return local, bounds, None, circles
+        xs, ys = zip(*local)
+        pieces = None
+        if len(self.edgedef._convexpieces) > 1:
+            pieces = []
+            for piece in self.edgedef._convexpieces:
+                plocal = place(piece)
+                pxs, pys = zip(*plocal)
+                bounds = (min(pxs), min(pys), max(pxs), max(pys))
+                pieces.append((plocal, edgeNormals(plocal), bounds))
+            pieces = tuple(pieces)
+        return local, (min(xs), min(ys), max(xs), max(ys)), pieces, None
+
+    @property
+    def _absolutevertices(self):
+        """
+        Window-relative list of vertex coordinates for the current position
+        """
+        self.setExtents()
+        if self._localkey is None:
+            # the transform was changed in bulk, by a SpriteArray
+            self._xformVertices()
+        if self._localvertices is not None and self._vertexpos != self.position:
+            # a pure translation of the cached shape
+            px, py = self._vertexpos = self.position
+            self._vertices = [(px + x, py + y) for x, y in self._localvertices]
+        return self._vertices
+
+    def _convexPieces(self):
+        """
+        Window-relative (vertices, edge normals, extents) of each convex piece
+        of the boundary. A convex boundary is a single piece.
+        """
+        vertices = self._absolutevertices
+        if self._localpieces is None:
+            bounds = (self.xmin, self.ymin, self.xmax, self.ymax)
+            return ((vertices, self._edgeNormals(), bounds),)
+        if self._piecepos != self.position:
+            px, py = self._piecepos = self.position
+            self._pieces = tuple(
+                (
+                    [(px + x, py + y) for x, y in local],
+                    normals,
+                    (px + b[0], py + b[1], px + b[2], py + b[3]),
+                )
+                for local, normals, b in self._localpieces
+            )
+        return self._pieces
+
+    def _edgeCircles(self):
+        """
+        Window-relative (center, radius) of each circle of a circular or
+        circle group boundary, or `None` for a polygonal boundary
+        """
+        self.setExtents()
+        if isinstance(self.edgedef, CircleAsset):
+            center = ((self.xmin + self.xmax) / 2, (self.ymin + self.ymax) / 2)
+            return ((center, self.edgedef.radius * self.scale),)
+        if not isinstance(self.edgedef, CircleGroupAsset):
+            return None
+        if self._localkey is None:
+            # the transform was changed in bulk, by a SpriteArray
+            self._xformVertices()
+        if self._circlepos != self.position:
+            px, py = self._circlepos = self.position
+            self._circles = tuple(
+                ((px + x, py + y), r) for (x, y), r in self._localcircles
+            )
+        return self._circles
+
+    def _edgeNormals(self):
+        """
+        Return boundary edge normals, recalculated only after rotation or scale
+        """
+        key = (self.rotation, self.scale)
+        if self._normalskey != key:
+            self._normals = edgeNormals(self._absolutevertices)
+            self._normalskey = key
+        return self._normals
 
     def setExtents(self):
         """
@@ -171,12 +367,33 @@ class Sprite(object):  # pylint: disable=too-many-public-methods
             else:
                 # Build vertex list
                 self._xformVertices()
-                x, y = zip(*self._absolutevertices)
-                self.xmin = min(x)
-                self.xmax = max(x)
-                self.ymin = min(y)
-                self.ymax = max(y)
+                px, py = self.position
+                xmin, ymin, xmax, ymax = self._localbounds
+                self.xmin = px + xmin
+                self.xmax = px + xmax
+                self.ymin = py + ymin
+                self.ymax = py + ymax
             self._extentsdirty = False
+            if App._spatialhash is not None:
+                App._spatialhash.move(self)
+
+    def _setExtentsDirty(self):
+        """
+        Flag the extents for recalculation before the next collision test
+        """
+        self._extentsdirty = True
+        self._version = next(_versions)
+        if App._spatialhash is not None:
+            App._spatialhash.invalidate(self)
+        if self._static:
+            self._staticMoved()
+
+    def _staticMoved(self):
+        """
+        Discard the static tree after a static sprite has moved after all
+        """
+        if App._statictree is not None and self in App._static:
+            App._statictree = None
 
     def firstImage(self):
         """
@@ -185,6 +402,7 @@ class Sprite(object):  # pylint: disable=too-many-public-methods
         defined with multiple images.
         """
         self.gfx.texture = self.asset[0]
+        self._version = next(_versions)
 
     def lastImage(self):
         """
@@ -193,6 +411,7 @@ class Sprite(object):  # pylint: disable=too-many-public-methods
         defined with multiple images.
         """
         self.gfx.texture = self.asset[-1]
+        self._version = next(_versions)
 
     def nextImage(self, wrap=False):
         """
@@ -214,6 +433,7 @@ class Sprite(object):  # pylint: disable=too-many-public-methods
             else:
                 self._index = len(self.asset) - 1
         self.gfx.texture = self.asset[self._index]
+        self._version = next(_versions)
 
     def prevImage(self, wrap=False):
         """
@@ -235,6 +455,7 @@ class Sprite(object):  # pylint: disable=too-many-public-methods
             else:
                 self._index = 0
         self.gfx.texture = self.asset[self._index]
+        self._version = next(_versions)
 
     def setImage(self, index=0):
         """
@@ -276,6 +497,7 @@ class Sprite(object):  # pylint: disable=too-many-public-methods
         except:  # pylint: disable=bare-except
             self._index = 0
             self.gfx.texture = self.asset[self._index]
+        self._version = next(_versions)
 
     @property
     def width(self):
@@ -288,7 +510,7 @@ class Sprite(object):  # pylint: disable=too-many-public-methods
     @width.setter
     def width(self, value):
         self.gfx.width = value
-        self._extentsdirty = True
+        self._setExtentsDirty()
 
     @property
     def height(self):
@@ -301,7 +523,7 @@ class Sprite(object):  # pylint: disable=too-many-public-methods
     @height.setter
     def height(self, value):
         self.gfx.height = value
-        self._extentsdirty = True
+        self._setExtentsDirty()
 
     @property
     def x(self):
@@ -318,6 +540,11 @@ class Sprite(object):  # pylint: disable=too-many-public-methods
         self.xmin += delta_x
         # Adjust extents directly with low overhead
         self.gfx.position.x = value
+        self._version = next(_versions)
+        if App._spatialhash is not None and not self._extentsdirty:
+            App._spatialhash.move(self)
+        if self._static:
+            self._staticMoved()
 
     @property
     def y(self):
@@ -334,6 +561,11 @@ class Sprite(object):  # pylint: disable=too-many-public-methods
         self.ymin += delta_y
         # Adjust extents directly with low overhead
         self.gfx.position.y = value
+        self._version = next(_versions)
+        if App._spatialhash is not None and not self._extentsdirty:
+            App._spatialhash.move(self)
+        if self._static:
+            self._staticMoved()
 
     @property
     def position(self):
@@ -365,7 +597,7 @@ class Sprite(object):  # pylint: disable=too-many-public-methods
     def fxcenter(self, value):
         try:
             self.gfx.anchor.x = value
-            self._extentsdirty = True
+            self._setExtentsDirty()
         except:  # pylint: disable=bare-except
             pass
 
@@ -387,7 +619,7 @@ class Sprite(object):  # pylint: disable=too-many-public-methods
     def fycenter(self, value):
         try:
             self.gfx.anchor.y = value
-            self._extentsdirty = True
+            self._setExtentsDirty()
         except:  # pylint: disable=bare-except
             pass
 
@@ -409,7 +641,7 @@ class Sprite(object):  # pylint: disable=too-many-public-methods
         try:
             self.gfx.anchor.x = value[0]
             self.gfx.anchor.y = value[1]
-            self._extentsdirty = True
+            self._setExtentsDirty()
         except:  # pylint: disable=bare-except
             pass
 
@@ -442,7 +674,7 @@ class Sprite(object):  # pylint: disable=too-many-public-methods
     def scale(self, value):
         self.gfx.scale.x = value
         self.gfx.scale.y = value
-        self._extentsdirty = True
+        self._setExtentsDirty()
 
     @property
     def rotation(self):
@@ -461,10 +693,106 @@ class Sprite(object):  # pylint: disable=too-many-public-methods
     def rotation(self, value):
         if self.gfx.rotation != -value:
             self.gfx.rotation = -value
-            self._extentsdirty = True
+            self._setExtentsDirty()
+
+    @property
+    def continuous(self):
+        """
+        Set this boolean attribute to `True` for fast-moving sprites, such as
+        projectiles, that may pass right through another sprite from one
+        frame to the next. Collision tests involving the sprite then consider
+        the whole distance it moved during the current frame, rather than
+        only where it is now. See :meth:`timeOfImpact`.
+        """
+        return self._continuous
+
+    @continuous.setter
+    def continuous(self, value):
+        value = bool(value)
+        if value != self._continuous:
+            self._continuous = value
+            self._version = next(_versions)
+            if not value:
+                App._continuous.pop(self, None)
+            elif self in App.spritelist:
+                App._continuous[self] = App._extents(self)
+
+    @property
+    def static(self):
+        """
+        Set this boolean attribute to `True` for sprites that never move,
+        such as walls and platforms. Static sprites are kept in a separate
+        bounding volume tree that is only rebuilt when static sprites are
+        added or removed, so collision tests against them are fast no matter
+        how many there are. Static sprites are never tested for collisions
+        with each other.
+
+        A static sprite may still be moved, but each move causes the tree to
+        be rebuilt.
+        """
+        return self._static
+
+    @static.setter
+    def static(self, value):
+        value = bool(value)
+        if value != self._static:
+            registered = self in App.spritelist
+            if registered:
+                App._removeFromBroadPhase(self)
+            self._static = value
+            if registered:
+                App._addToBroadPhase(self)
+
+    @property
+    def collisionlayer(self):
+        """
+        An integer bit field of the collision layers that this sprite belongs
+        to. Two sprites can only collide if each one's :data:`collisionlayer`
+        shares a bit with the other's :data:`collisionmask`, which is checked
+        before any other collision work. By default every sprite is in
+        layer 1 (bit 0) only.
+
+        Example of use::
+
+            PLAYER, ENEMY, BULLET = 1, 2, 4
+            bullet.collisionlayer = BULLET
+            bullet.collisionmask = ENEMY
+        """
+        return self._collisionlayer
+
+    @collisionlayer.setter
+    def collisionlayer(self, value):
+        if value < 0:
+            raise ValueError("collision layer must not be negative")
+        if value != self._collisionlayer:
+            registered = self in App.spritelist
+            if registered:
+                App._removeFromLayers(self, self._collisionlayer)
+            self._collisionlayer = value
+            self._layersChanged()
+            if registered:
+                App._addToLayers(self, value)
+
+    @property
+    def collisionmask(self):
+        """
+        An integer bit field of the collision layers that this sprite can
+        collide with. See :data:`collisionlayer`. The default of -1 has every
+        bit set, so the sprite can collide with sprites in any layer.
+        """
+        return self._collisionmask
+
+    @collisionmask.setter
+    def collisionmask(self, value):
+        self._collisionmask = value
+        self._layersChanged()
+
+    def _layersChanged(self):
+        # sprites with the default layer and mask skip the layer test
+        self._defaultlayers = self._collisionlayer == 1 and self._collisionmask == -1
 
     @classmethod
-    def collidingCircleWithPoly(cls, circ, poly):  # pylint: disable=unused-argument
+    def collidingCircleWithPoly(cls, circ, poly):
         """
         Determine if a CircleAsset sprite overlaps with a PolygonAsset sprite. This
         method is called after determining that the two objects are overlapping in their
@@ -475,7 +803,20 @@ class Sprite(object):  # pylint: disable=too-many-public-methods
         :returns: True if the sprites are overlapping, False otherwise.
         :rtype: boolean
         """
-        return True  # no implementation yet
+        center = ((circ.xmin + circ.xmax) / 2, (circ.ymin + circ.ymax) / 2)
+        return poly._touchesCircle(center, circ.edgedef.radius * circ.scale)
+
+    def _touchesCircle(self, center, radius):
+        """
+        Determine if a circle overlaps any convex piece of the boundary
+        """
+        cx, cy = center
+        return any(
+            circleTouchesPolygon(center, radius, vertices)
+            for vertices, _, b in self._convexPieces()
+            if b[0] - radius <= cx <= b[2] + radius
+            and b[1] - radius <= cy <= b[3] + radius
+        )
 
     def collidingPolyWithPoly(self, obj):
         """
@@ -487,8 +828,32 @@ class Sprite(object):  # pylint: disable=too-many-public-methods
         :param Sprite obj: A PolygonAsset-based sprite.
         :returns: True if slef overlaps with obj, False otherwise.
         :rtype: boolean
+
+        The separating axis test is exact for convex boundaries. A concave
+        :class:`~ggame.asset.PolygonAsset` boundary is tested as the convex
+        pieces that it was divided into when it was created, skipping pairs
+        of pieces whose extents do not overlap.
         """
-        return True  # no implementation yet
+        if self._localpieces is None and obj._localpieces is None:
+            return polygonsOverlap(
+                self._absolutevertices,
+                self._edgeNormals(),
+                obj._absolutevertices,
+                obj._edgeNormals(),
+            )
+        spieces = self._convexPieces()
+        opieces = obj._convexPieces()
+        for va, na, ba in spieces:
+            for vb, nb, bb in opieces:
+                if (
+                    ba[0] <= bb[2]
+                    and bb[0] <= ba[2]
+                    and ba[1] <= bb[3]
+                    and bb[1] <= ba[3]
+                    and polygonsOverlap(va, na, vb, nb)
+                ):
+                    return True
+        return False
 
     def collidingWith(self, obj):
         """
@@ -500,34 +865,255 @@ class Sprite(object):  # pylint: disable=too-many-public-methods
         :rtype: boolean
 
         :returns: `True` if this the sprites are overlapping, `False` otherwise.
+
+        A sprite whose :class:`~ggame.asset.ImageAsset` was created with
+        `pixelmask=True` only collides where its image is opaque.
+
+        If either sprite is in :data:`continuous` mode then the sprites are
+        also colliding if they touched at any time during the current frame.
+
+        When the extents of the sprites overlap, the result of the careful
+        overlap test is remembered until the end of the animation frame, or
+        until either sprite moves, turns, scales or changes image, so testing
+        the same pair again (in either order) costs a dictionary lookup.
         """
-        if self is obj:
+        if self is obj or self._dying or obj._dying:
             return False
-        self.setExtents()
-        obj.setExtents()
-        # Gross check for overlap will usually rule out a collision
+        if not (self._defaultlayers and obj._defaultlayers) and (
+            not self._collisionlayer & obj._collisionmask
+            or not obj._collisionlayer & self._collisionmask
+        ):
+            return False
+        # sprites in continuous mode also collide if they met during the frame
+        continuous = self._continuous or obj._continuous
+        if not self._extentsOverlap(obj):
+            return continuous and self.timeOfImpact(obj) is not None
+        # only the careful test is worth remembering: results are kept by
+        # sprite ids in a canonical order, with the version of each sprite's
+        # geometry when the result was found
+        if id(self) < id(obj):
+            first, second = self, obj
+        else:
+            first, second = obj, self
+        pair = (id(first), id(second))
+        cache = App._pairresults
+        cached = cache.get(pair)
         if (
+            cached is not None
+            and cached[0] == first._version
+            and cached[1] == second._version
+        ):
+            return cached[2]
+        result = self._overlappingShapes(obj) or (
+            continuous and self.timeOfImpact(obj) is not None
+        )
+        if len(cache) >= _PAIRCACHESIZE:
+            cache.clear()
+        cache[pair] = (first._version, second._version, result)
+        return result
+
+    def _extentsOverlap(self, obj):
+        """
+        Gross check for overlap, which will usually rule out a collision
+        """
+        if self._extentsdirty:
+            self.setExtents()
+        if obj._extentsdirty:
+            obj.setExtents()
+        return not (
             self.xmin > obj.xmax
             or self.xmax < obj.xmin
             or self.ymin > obj.ymax
             or self.ymax < obj.ymin
+        )
+
+    def _overlapping(self, obj):
+        """
+        Determine if the sprites overlap at their current positions
+        """
+        return self._extentsOverlap(obj) and self._overlappingShapes(obj)
+
+    def _overlappingShapes(self, obj):
+        """
+        Carefully determine if sprites with overlapping extents overlap
+        """
+        if not (self._masked or obj._masked):
+            return self._collidingEdges(obj)
+        smask = self._pixelMask()
+        omask = obj._pixelMask()
+        mask = smask or omask
+        if mask is None:
+            return self._collidingEdges(obj)
+        if smask and omask:
+            return masksOverlap(*smask, *omask)
+        # the mask must reach into the other sprite's boundary
+        other = obj if smask else self
+        return self._collidingEdges(obj) and maskTouchesRect(
+            *mask, other.xmin, other.ymin, other.xmax, other.ymax
+        )
+
+    def timeOfImpact(self, obj):
+        """
+        Determine when, during the current frame, this sprite first touched
+        another sprite. Both sprites are assumed to have moved in a straight
+        line from where they were at the start of the frame. A sprite that is
+        not in :data:`continuous` mode is assumed to have been where it is now
+        for the whole frame.
+
+        Two sprites with :class:`~ggame.asset.CircleAsset` edge definitions
+        are swept as circles. Otherwise the sprites are swept as their
+        rectangular extents, which may report contact where only the extents
+        meet.
+
+        :param Sprite obj: A reference to another Sprite object.
+
+        :rtype: float
+
+        :returns: The fraction of the frame (0.0 to 1.0) at which the sprites
+            first touched, or `None` if they did not touch.
+        """
+        if self is obj or self._dying or obj._dying:
+            return None
+        self.setExtents()
+        obj.setExtents()
+        a0 = self._startExtents()
+        b0 = obj._startExtents()
+        # motion relative to the other sprite
+        dx = (self.xmin - a0[0]) - (obj.xmin - b0[0])
+        dy = (self.ymin - a0[1]) - (obj.ymin - b0[1])
+        if not dx and not dy:
+            return 0.0 if self._overlapping(obj) else None
+        if isinstance(self.edgedef, CircleAsset) and isinstance(
+            obj.edgedef, CircleAsset
         ):
-            return False
-        # Otherwise, perform a careful overlap determination
-        if isinstance(self.asset, CircleAsset):
-            if isinstance(obj.asset, CircleAsset):
+            ax = (a0[0] + a0[2]) / 2
+            ay = (a0[1] + a0[3]) / 2
+            return segmentCircleEntry(
+                (ax, ay),
+                (ax + dx, ay + dy),
+                ((b0[0] + b0[2]) / 2, (b0[1] + b0[3]) / 2),
+                self.edgedef.radius * self.scale + obj.edgedef.radius * obj.scale,
+            )
+        # sweep our corner across the other extents, grown by our size
+        return segmentBoxEntry(
+            (a0[0], a0[1]),
+            (a0[0] + dx, a0[1] + dy),
+            b0[0] - (a0[2] - a0[0]),
+            b0[1] - (a0[3] - a0[1]),
+            b0[2],
+            b0[3],
+        )
+
+    def _startExtents(self):
+        """
+        Extents at the start of the frame, for continuous collision tests
+        """
+        start = App._continuous.get(self) if self._continuous else None
+        return start or (self.xmin, self.ymin, self.xmax, self.ymax)
+
+    def _sweptExtents(self):
+        """
+        Extents enclosing both the start and current positions of the sprite
+        """
+        self.setExtents()
+        x0, y0, x1, y1 = self._startExtents()
+        return (
+            min(x0, self.xmin),
+            min(y0, self.ymin),
+            max(x1, self.xmax),
+            max(y1, self.ymax),
+        )
+
+    def _collidingEdges(self, obj):
+        """
+        Determine if the collision boundaries of two sprites overlap
+        """
+        if isinstance(self.edgedef, CircleGroupAsset) or isinstance(
+            obj.edgedef, CircleGroupAsset
+        ):
+            return self._collidingCircles(obj)
+        if isinstance(self.edgedef, CircleAsset):
+            if isinstance(obj.edgedef, CircleAsset):
                 # two circles .. check distance between
                 sx = (self.xmin + self.xmax) / 2
                 sy = (self.ymin + self.ymax) / 2
                 ox = (obj.xmin + obj.xmax) / 2
                 oy = (obj.ymin + obj.ymax) / 2
                 d = math.sqrt((sx - ox) ** 2 + (sy - oy) ** 2)
-                return d <= self.width / 2 + obj.width / 2
+                return (
+                    d
+                    <= self.edgedef.radius * self.scale + obj.edgedef.radius * obj.scale
+                )
             return self.collidingCircleWithPoly(self, obj)
-        if isinstance(obj.asset, CircleAsset):
+        if isinstance(obj.edgedef, CircleAsset):
             return self.collidingCircleWithPoly(obj, self)
         return self.collidingPolyWithPoly(obj)
 
+    def _collidingCircles(self, obj):
+        """
+        Determine if the boundaries overlap, when at least one of them is a
+        circle group
+        """
+        scircles = self._edgeCircles()
+        ocircles = obj._edgeCircles()
+        if scircles is None or ocircles is None:
+            poly = self if scircles is None else obj
+            circles = ocircles if scircles is None else scircles
+            return any(poly._touchesCircle(c, r) for c, r in circles)
+        for (ax, ay), ar in scircles:
+            for (bx, by), br in ocircles:
+                if (ax - bx) ** 2 + (ay - by) ** 2 <= (ar + br) ** 2:
+                    return True
+        return False
+
+    def _pixelMask(self):
+        """
+        Return the pixel mask of the current image and the window position of
+        its upper left corner, or `None` if the sprite has no usable mask
+        """
+        asset = self.edgedef
+        if (
+            asset is not self.asset
+            or not isinstance(asset, ImageAsset)
+            or not asset.pixelmask
+            or self.rotation
+            or self.scale != 1.0
+        ):
+            return None
+        mask = asset._mask(self._index)
+        if mask is None:
+            return None
+        return mask, round(self.xmin), round(self.ymin)
+
+    def segmentEntry(self, p0, p1):
+        """
+        Determine where a line segment first crosses into this sprite.
+
+        :param tuple(float,float) p0: The (x,y) start of the segment.
+        :param tuple(float,float) p1: The (x,y) end of the segment.
+
+        :rtype: float
+
+        :returns: The fraction (0.0 to 1.0) of the way from `p0` to `p1` at
+            which the segment enters the sprite, 0.0 if `p0` is already
+            inside the sprite, or `None` if the segment misses the sprite.
+        """
+        if self._dying:
+            return None
+        self.setExtents()
+        # Gross check against the extents will usually rule out a hit
+        if segmentBoxEntry(p0, p1, self.xmin, self.ymin, self.xmax, self.ymax) is None:
+            return None
+        circles = self._edgeCircles()
+        if circles is not None:
+            entries = [segmentCircleEntry(p0, p1, c, r) for c, r in circles]
+        else:
+            entries = [
+                segmentPolygonEntry(p0, p1, vertices)
+                for vertices, _, _ in self._convexPieces()
+            ]
+        return min((t for t in entries if t is not None), default=None)
+
     def collidingWithSprites(self, sclass=None):
         """
         Determine if this sprite is colliding with any other sprites
@@ -535,18 +1121,41 @@ class Sprite(object):  # pylint: disable=too-many-public-methods
 
         :param class sclass: A class identifier that is either :class:`Sprite`
             or a subclass of it that identifies the class of sprites to check
-            for collisions. If `None` then all objects that are subclassed from
+            for collisions. Sprites of classes derived from `sclass` are also
+            checked. If `None` then all objects that are subclassed from
             the :class:`Sprite` class are checked.
 
         :rtype: list
 
         :returns: A (potentially empty) list of sprite objects of the given
             class that are overlapping with this sprite.
+
+        If the spatial hash has been enabled with
+        :meth:`~ggame.app.App.enableSpatialHash` then only nearby sprites are
+        checked, and the order of the returned list is unspecified.
+        :data:`static` sprites are always found through the static tree, and
+        a static sprite is never reported as colliding with another.
         """
-        if sclass is None:
+        if App._spatialhash is not None:
+            slist = App._spatialhash.query(*self._sweptExtents())
+            if sclass is not None:
+                slist = [s for s in slist if isinstance(s, sclass)]
+        elif sclass is not None:
+            slist = App.getSpritesbyClass(sclass)
+        elif self._collisionmask == -1:
             slist = App.spritelist
         else:
-            slist = App.getSpritesbyClass(sclass)
+            # only sprites in layers this sprite can collide with
+            slist = App.getSpritesbyLayer(self._collisionmask)
+        if App._static:
+            slist = [s for s in slist if not s._static]
+            if not self._static:
+                tree = App._staticTree()
+                slist.extend(
+                    s
+                    for s in tree.query(*self._sweptExtents())
+                    if sclass is None or isinstance(s, sclass)
+                )
         return list(filter(self.collidingWith, slist))
 
     @staticmethod
@@ -574,8 +1183,146 @@ class Sprite(object):  # pylint: disable=too-many-public-methods
         or used. If you only want to prevent a sprite from being displayed,
         set the :data:`visible` attribute to `False`.
         """
+        if self._forget is not None:
+            # a pooled sprite leaves its pool
+            self._forget(self)
         try:
             App.remove(self)
             self.gfx.destroy()
+            self._releaseTexture()
         except ValueError:
             pass
+
+    def _releaseTexture(self):
+        # release the shared texture acquired on construction, even if the
+        # sprite has since changed its asset
+        if self._sharedtexture is not None:
+            self._sharedtexture._releaseTexture()
+            self._sharedtexture = None
+
+    def destroyLater(self):
+        """
+        Destroy the sprite at the end of the current animation frame, rather
+        than immediately. The sprite stops colliding with other sprites right
+        away, but remains in :data:`~ggame.app.App.spritelist` until the frame
+        ends. This is the cheapest and safest way to destroy sprites from
+        within a `step` method, since lists of sprites being iterated over are
+        not disturbed.
+        """
+        self._dying = True
+        App.destroyLater(self)
+
+
+class SpritePool(object):
+    """
+    A SpritePool creates a number of identical sprites up front and then
+    hands them out and takes them back, rather than creating and destroying
+    sprites. This is useful for short-lived sprites such as bullets and
+    particles, which would otherwise be created and destroyed constantly.
+
+    Sprites that are not in use are hidden and are left out of
+    :data:`~ggame.app.App.spritelist`, class queries and collision tests,
+    but their underlying graphics objects are kept.
+
+    :param asset asset: The graphical asset shared by all pooled sprites.
+
+    :param int size: The number of sprites to create in advance. If more
+        sprites are requested than are available, the pool grows.
+
+    :param class sclass: The :class:`Sprite` class (or subclass) to create.
+        It is instantiated as `sclass(asset, pos, edgedef)`.
+
+    :param asset edgedef: An optional edge definition asset, as used by
+        :class:`Sprite`.
+
+    Example of use::
+
+        bullets = SpritePool(RectangleAsset(4, 4), 100)
+        b = bullets.acquire((100, 100))
+        ...
+        bullets.release(b)
+    """
+
+    def __init__(self, asset, size, sclass=Sprite, edgedef=None):
+        self.asset = asset
+        self.sclass = sclass
+        self.edgedef = edgedef
+        # both insertion ordered, so that sprites can be forgotten in O(1)
+        self._free = {}
+        self._active = {}
+        for _ in range(size):
+            self._free[self._park(self._create())] = None
+
+    def _create(self):
+        sprite = self.sclass(self.asset, (0, 0), self.edgedef)
+        sprite._forget = self._forget
+        return sprite
+
+    def _forget(self, sprite):
+        # the sprite has been destroyed, and must never be handed out again
+        self._active.pop(sprite, None)
+        self._free.pop(sprite, None)
+
+    @staticmethod
+    def _park(sprite):
+        sprite.visible = False
+        App._park(sprite)
+        return sprite
+
+    def acquire(self, pos=(0, 0)):
+        """
+        Take a sprite from the pool, make it visible and add it to the
+        application at the given position.
+
+        :param tuple(int,int) pos: The (x,y) position for the sprite.
+        :rtype: Sprite
+        :returns: A sprite that is now in use.
+        """
+        if self._free:
+            sprite, _ = self._free.popitem()
+            sprite._dying = False
+            sprite.position = pos
+            App._unpark(sprite)
+        else:
+            sprite = self._create()
+            sprite.position = pos
+        sprite.visible = True
+        self._active[sprite] = None
+        return sprite
+
+    def release(self, sprite):
+        """
+        Return a sprite to the pool. The sprite is hidden and no longer takes
+        part in collision tests. Releasing a sprite that is not in use has no
+        effect. If :meth:`~Sprite.destroyLater` was called for the sprite
+        during the current frame, the sprite is returned to the pool instead
+        of being destroyed.
+
+        :param Sprite sprite: A sprite previously returned by :meth:`acquire`.
+        :returns: None
+        """
+        if sprite in self._active:
+            del self._active[sprite]
+            App._reaplist.pop(sprite, None)
+            self._free[self._park(sprite)] = None
+
+    @property
+    def active(self):
+        """
+        A tuple of the sprites from this pool that are currently in use.
+        """
+        return tuple(self._active)
+
+    @property
+    def available(self):
+        """
+        The number of sprites that may be acquired without growing the pool.
+        """
+        return len(self._free)
+
+    def destroy(self):
+        """
+        Destroy every sprite belonging to the pool, whether in use or not.
+        """
+        for sprite in list(self._active) + list(self._free):
+            sprite.destroy()
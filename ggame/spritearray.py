@@ -0,0 +1,274 @@
+"""
+SpriteArray class for moving and transforming large numbers of identical
+sprites at once. This module requires the optional NumPy package, which is
+not available when ggame runs in the browser.
+"""
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from ggame.asset import CircleAsset
+from ggame.app import App
+from ggame.sprite import Sprite, _versions
+
+
+# SpriteArray maintains the sprites' extents and vertex caches on their behalf
+# pylint: disable=protected-access
+
+
+# pylint: disable=useless-object-inheritance
+class _Column(object):
+    """
+    Expose one of the SpriteArray arrays, trimmed to the number of sprites.
+    Assigning to the attribute copies values into the existing array, so
+    in-place arithmetic such as `arr.x += 1` works as expected.
+    """
+
+    def __init__(self, doc, readonly=False):
+        self.__doc__ = doc
+        self.readonly = readonly
+        self.name = None
+
+    def __set_name__(self, owner, name):
+        self.name = "_" + name
+
+    def __get__(self, obj, objtype=None):
+        if obj is None:
+            return self
+        return getattr(obj, self.name)[: obj._count]
+
+    def __set__(self, obj, value):
+        if self.readonly:
+            raise AttributeError(f"{self.name[1:]} is calculated by updateExtents")
+        getattr(obj, self.name)[: obj._count] = value
+
+
+class SpriteArray(object):
+    """
+    A SpriteArray creates and owns a collection of identical sprites, and
+    keeps their positions, rotations, scales, centers and extents in NumPy
+    arrays. Whole swarms of sprites may then be moved with a single array
+    operation instead of setting attributes on each sprite in turn. Call
+    :meth:`sync` once per frame, after the arrays have been changed, to push
+    the new values to the sprites' graphics objects.
+
+    The sprites are ordinary :class:`~ggame.sprite.Sprite` objects that take
+    part in collision tests and class queries. While a sprite belongs to a
+    SpriteArray, change its position and transform through the array, since
+    :meth:`sync` overwrites any changes made through the sprite itself.
+
+    :param asset asset: The graphical asset shared by all of the sprites.
+        This must be an image or shape asset, not a
+        :class:`~ggame.asset.TextAsset`.
+
+    :param list positions: A list of (x,y) positions, one for each sprite to
+        create. More sprites may be added later with :meth:`append`.
+
+    :param class sclass: The :class:`~ggame.sprite.Sprite` class (or
+        subclass) to create. It is instantiated as
+        `sclass(asset, pos, edgedef)`.
+
+    :param asset edgedef: An optional edge definition asset, as used by
+        :class:`~ggame.sprite.Sprite`.
+
+    Example of use::
+
+        stars = SpriteArray(CircleAsset(2), [(i, 0) for i in range(0, 640, 4)])
+        vy = numpy.random.uniform(50, 100, len(stars))
+
+        def step():
+            stars.y += vy / 60
+            stars.sync()
+    """
+
+    x = _Column("An array of sprite x-coordinates.")
+    y = _Column("An array of sprite y-coordinates.")
+    rotation = _Column("An array of sprite rotations, in radians.")
+    scale = _Column("An array of sprite scale factors.")
+    fxcenter = _Column("An array of horizontal sprite centers (0.0 to 1.0).")
+    fycenter = _Column("An array of vertical sprite centers (0.0 to 1.0).")
+    xmin = _Column("An array of left sprite extents. Read only.", True)
+    xmax = _Column("An array of right sprite extents. Read only.", True)
+    ymin = _Column("An array of top sprite extents. Read only.", True)
+    ymax = _Column("An array of bottom sprite extents. Read only.", True)
+
+    _fields = (
+        "_x",
+        "_y",
+        "_rotation",
+        "_scale",
+        "_fxcenter",
+        "_fycenter",
+        "_xmin",
+        "_xmax",
+        "_ymin",
+        "_ymax",
+        "_width",
+        "_height",
+    )
+
+    def __init__(self, asset, positions=(), sclass=Sprite, edgedef=None):
+        if np is None:
+            raise ImportError("SpriteArray requires the numpy package")
+        self.asset = asset
+        self.sclass = sclass
+        self.edgedef = edgedef
+        self._sprites = []
+        self._count = 0
+        empty = np.zeros(0)
+        self._x = self._y = self._rotation = self._scale = empty
+        self._fxcenter = self._fycenter = self._width = self._height = empty
+        self._xmin = self._xmax = self._ymin = self._ymax = empty
+        self._synced = None
+        for pos in positions:
+            self.append(pos)
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        return self._sprites[index]
+
+    def __iter__(self):
+        return iter(self._sprites)
+
+    def _grow(self, capacity):
+        for field in self._fields:
+            old = getattr(self, field)
+            new = np.zeros(capacity)
+            new[: self._count] = old[: self._count]
+            setattr(self, field, new)
+
+    def append(self, pos=(0, 0)):
+        """
+        Create a new sprite and add it to the end of the arrays.
+
+        :param tuple(int,int) pos: The (x,y) position for the sprite.
+        :rtype: Sprite
+        :returns: The new sprite.
+        """
+        sprite = self.sclass(self.asset, pos, self.edgedef)
+        i = self._count
+        if i == len(self._x):
+            self._grow(max(16, 2 * i))
+        self._sprites.append(sprite)
+        self._count += 1
+        self._x[i], self._y[i] = sprite.position
+        self._rotation[i] = sprite.rotation
+        self._scale[i] = sprite.scale
+        self._fxcenter[i], self._fycenter[i] = sprite.center
+        # dimensions of the unscaled sprite
+        self._width[i] = sprite.width / sprite.scale
+        self._height[i] = sprite.height / sprite.scale
+        self._xmin[i] = sprite.xmin
+        self._xmax[i] = sprite.xmax
+        self._ymin[i] = sprite.ymin
+        self._ymax[i] = sprite.ymax
+        return sprite
+
+    def updateExtents(self):
+        """
+        Recalculate the :data:`xmin`, :data:`xmax`, :data:`ymin` and
+        :data:`ymax` arrays from the current positions and transforms, in the
+        same way that :meth:`~ggame.sprite.Sprite.setExtents` does for a
+        single sprite. This is called automatically by :meth:`sync`.
+
+        :returns: None
+        """
+        n = self._count
+        if not n:
+            return
+        x, y, rot, sc = self.x, self.y, self.rotation, self.scale
+        fx, fy = self.fxcenter, self.fycenter
+        edgedef = self._sprites[0].edgedef
+        if isinstance(edgedef, CircleAsset):
+            th = np.arctan2(fy - 0.5, 0.5 - fx) + rot
+            d = edgedef.radius * 2 * sc
+            l = np.hypot(fx - 0.5, fy - 0.5) * d
+            np.add(x + np.trunc(l * np.cos(th)), -(d // 2), out=self._xmin[:n])
+            np.add(y - np.trunc(l * np.sin(th)), -(d // 2), out=self._ymin[:n])
+            np.add(self._xmin[:n], d, out=self._xmax[:n])
+            np.add(self._ymin[:n], d, out=self._ymax[:n])
+            return
+        # one row per sprite, one column per boundary vertex
+        bx, by = np.array(edgedef._hullvertices, dtype=float).T
+        cx = (bx - (self._width[:n] * fx)[:, None]) * sc[:, None]
+        cy = (by - (self._height[:n] * fy)[:, None]) * sc[:, None]
+        c = np.cos(rot)[:, None]
+        s = np.sin(rot)[:, None]
+        rx = cx * c + cy * s
+        ry = cy * c - cx * s
+        np.add(x, rx.min(axis=1), out=self._xmin[:n])
+        np.add(x, rx.max(axis=1), out=self._xmax[:n])
+        np.add(y, ry.min(axis=1), out=self._ymin[:n])
+        np.add(y, ry.max(axis=1), out=self._ymax[:n])
+
+    def sync(self):
+        """
+        Recalculate the extents and copy the arrays to the sprites and their
+        graphics objects. Call this once per frame, after changing any of the
+        arrays.
+
+        :returns: None
+        """
+        self.updateExtents()
+        n = self._count
+        transform = np.stack((self.rotation, self.scale, self.fxcenter, self.fycenter))
+        if self._synced is None or self._synced.shape != transform.shape:
+            changed = np.ones(n, dtype=bool)
+        else:
+            changed = (transform != self._synced).any(axis=0)
+        self._synced = transform
+        if n and isinstance(self._sprites[0].edgedef, CircleAsset):
+            # circular boundaries have no vertices to rebuild
+            changed[:] = False
+        columns = [
+            a[:n].tolist()
+            for a in (
+                self._x,
+                self._y,
+                -self._rotation,
+                self._scale,
+                self._fxcenter,
+                self._fycenter,
+                self._xmin,
+                self._xmax,
+                self._ymin,
+                self._ymax,
+            )
+        ]
+        spatialhash = App._spatialhash
+        for sprite, dirty, x, y, r, sc, fx, fy, x0, x1, y0, y1 in zip(
+            self._sprites, changed.tolist(), *columns
+        ):
+            gfx = sprite.gfx
+            gfx.position.x = x
+            gfx.position.y = y
+            gfx.rotation = r
+            gfx.scale.x = gfx.scale.y = sc
+            gfx.anchor.x = fx
+            gfx.anchor.y = fy
+            sprite.xmin = x0
+            sprite.xmax = x1
+            sprite.ymin = y0
+            sprite.ymax = y1
+            sprite._extentsdirty = False
+            sprite._version = next(_versions)
+            if dirty:
+                # boundary vertices are rebuilt if they are needed
+                sprite._localkey = None
+            if spatialhash is not None:
+                spatialhash.move(sprite)
+            if sprite._static:
+                sprite._staticMoved()
+
+    def destroy(self):
+        """
+        Destroy every sprite belonging to the array.
+        """
+        for sprite in self._sprites:
+            sprite.destroy()
+        self._sprites = []
+        self._count = 0
+        self._synced = None
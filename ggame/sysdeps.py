@@ -27,6 +27,10 @@ if module_exists("browser"):
     SND_Sound = SND.sound.new
     GFX_DetectRenderer = GFX.autoDetectRenderer
 
+    def GFX_Mask(texture):
+        # texture pixels are not readily available; use the bounding rectangle
+        return None
+
     class GFX_Window(object):
         def __init__(self, width, height, onclose):
             canvas = window.document.getElementById("ggame-canvas")
@@ -49,6 +53,7 @@ if module_exists("browser"):
             self.renderer = GFX.autoDetectRenderer(self.width, self.height, options)
             attachpoint.appendChild(self.renderer.view)
             self._w.ggame_quit = onclose
+            self._geometry = None
 
         def bind(self, evtspec, callback):
             self._w.document.body.unbind(evtspec)
@@ -64,9 +69,22 @@ if module_exists("browser"):
             self._stage.removeChild(obj)
 
         def animate(self, stepcallback):
+            self._geometry = None
             self.renderer.render(self._stage)
             self._w.requestAnimationFrame(stepcallback)
 
+        def geometry(self):
+            # canvas position and scale, measured once per frame
+            if self._geometry is None:
+                rect = self.renderer.view.getBoundingClientRect()
+                self._geometry = (
+                    rect.left,
+                    rect.top,
+                    self.width / rect.width,
+                    self.height / rect.height,
+                )
+            return self._geometry
+
         def destroy(self):
             SND.all().stop()
             self.renderer.destroy()
@@ -44,6 +44,97 @@ class TestAppMethods(unittest.TestCase):
         # and destroy it
         a3.destroy()
 
+    def test_wildcardkeys(self):
+        a = App(100, 100)
+        log = []
+        space = lambda event: log.append("space")
+        anykey = lambda event: log.append("any")
+        a.listenKeyEvent(KeyEvent.keydown, "space", space)
+        a.listenKeyEvent(KeyEvent.keydown, "*", anykey)
+        # handlers run once per event, however many events there are
+        for _ in range(3):
+            a._keyEvent(keyevent("keydown", 32))
+        self.assertEqual(log, ["any", "space"] * 3)
+        del log[:]
+        a._keyEvent(keyevent("keydown", 65))
+        self.assertEqual(log, ["any"])
+        a.unlistenKeyEvent(KeyEvent.keydown, "*", anykey)
+        del log[:]
+        a._keyEvent(keyevent("keydown", 32))
+        a._keyEvent(keyevent("keydown", 65))
+        self.assertEqual(log, ["space"])
+        a.destroy()
+
+    def test_emptydispatch(self):
+        a = App(100, 100)
+        builds = []
+        build = App.__dict__["_dispatchTable"]
+        App._dispatchTable = classmethod(
+            lambda cls: builds.append(cls) or build.__func__(cls)
+        )
+        try:
+            # an empty table is built once, and kept until the listeners change
+            a._keyEvent(keyevent("keydown", 32))
+            a._keyEvent(keyevent("keydown", 32))
+            a._mouseEvent(mouseevent("mousemove", 1, 2, 0))
+            self.assertEqual(App._dispatch, {})
+            self.assertEqual(len(builds), 1)
+            a.listenKeyEvent(KeyEvent.keydown, "space", self.spacehandler)
+            a._keyEvent(keyevent("keydown", 32))
+            self.assertEqual(len(builds), 2)
+        finally:
+            App._dispatchTable = build
+        a.destroy()
+
+    def test_mousegeometry(self):
+        class View(object):
+            left, top, width, height = 10, 20, 50, 200
+
+            def getBoundingClientRect(self):
+                measured.append(self)
+                return self
+
+        measured = []
+        a = App(100, 100)
+        a.win.renderer.view = View()
+        moves = []
+        a.listenMouseEvent(MouseEvent.mousemove, moves.append)
+        for x in range(3):
+            a._mouseEvent(mouseevent("mousemove", 10 + x, 120, 0))
+        self.assertEqual([(e.x, e.y) for e in moves], [(0, 50), (2, 50), (4, 50)])
+        # the canvas is measured once per frame
+        self.assertEqual(len(measured), 1)
+        a.win.renderer.view.left = 0
+        a.win.animate(lambda dummy: None)
+        a._mouseEvent(mouseevent("mousemove", 10, 120, 0))
+        self.assertEqual(moves[-1].x, 20)
+        self.assertEqual(len(measured), 2)
+        a.unlistenMouseEvent(MouseEvent.mousemove, moves.append)
+        a.destroy()
+
+    def test_spritelist(self):
+        a = App(100, 100)
+        l = type(App.spritelist)()
+        objs = [object() for i in range(5)]
+        for obj in objs:
+            l.append(obj)
+        self.assertEqual(len(l), 5)
+        self.assertIn(objs[2], l)
+        l.remove(objs[2])
+        self.assertNotIn(objs[2], l)
+        self.assertRaises(ValueError, l.remove, objs[2])
+        self.assertEqual(l[0], objs[0])
+        self.assertEqual(l[-1], objs[4])
+        self.assertEqual(l[:], [objs[0], objs[1], objs[3], objs[4]])
+        # removing while iterating is safe and visits every original member
+        seen = []
+        for obj in l:
+            seen.append(obj)
+            l.remove(obj)
+        self.assertEqual(len(seen), 4)
+        self.assertEqual(len(l), 0)
+        a.destroy()
+
     def spacehandler(self, event):
         self.assertEqual(type(event), KeyEvent)
         self.keyevtx += 1
@@ -78,6 +78,22 @@ class TestImageAssetMethods(unittest.TestCase):
         self.assertEqual(p.gfx.jpath[4], 15)
         self.assertEqual(p.gfx.visible, False)
 
+    def test_polygontolerance(self):
+        # a wobbly 20x20 square traced with 80 vertices
+        path = [(i, i % 2 * 0.2) for i in range(20)]
+        path += [(20 - i % 2 * 0.2, i) for i in range(20)]
+        path += [(20 - i, 20 - i % 2 * 0.2) for i in range(20)]
+        path += [(i % 2 * 0.2, 20 - i) for i in range(20)]
+        path.append(path[0])
+        p = PolygonAsset(path, tolerance=0.5)
+        self.assertEqual(p.removedvertices, 76)
+        self.assertEqual(len(p._basevertices), 4)
+        # the drawn path keeps every vertex
+        self.assertEqual(len(p.gfx.jpath), 162)
+        self.assertEqual(PolygonAsset(path).removedvertices, 0)
+        with self.assertRaises(ValueError):
+            PolygonAsset(path, tolerance=-1)
+
     def test_textasset(self):
         t = TextAsset(
             "sample text",
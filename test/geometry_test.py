@@ -0,0 +1,144 @@
+import math
+import unittest
+from ggame.geometry import (
+    edgeNormals,
+    polygonsOverlap,
+    pointInPolygon,
+    circleTouchesPolygon,
+    convexHull,
+    triangulate,
+    convexDecomposition,
+    simplifyPolygon,
+    masksOverlap,
+    maskTouchesRect,
+    segmentBoxEntry,
+    segmentCircleEntry,
+    segmentPolygonEntry,
+)
+
+
+class TestGeometry(unittest.TestCase):
+    def test_polygonsoverlap(self):
+        square = [(0, 0), (0, 10), (10, 10), (10, 0)]
+        tri = [(12, 0), (20, 0), (12, 8)]
+        ns = edgeNormals(square)
+        nt = edgeNormals(tri)
+        self.assertFalse(polygonsOverlap(square, ns, tri, nt))
+        tri = [(x - 2, y) for x, y in tri]
+        self.assertTrue(polygonsOverlap(square, ns, tri, edgeNormals(tri)))
+        # diagonal separation that bounding boxes cannot detect
+        tri = [(10, 6), (6, 10), (10, 10)]
+        corner = [(0, 0), (5, 0), (0, 5)]
+        self.assertFalse(
+            polygonsOverlap(corner, edgeNormals(corner), tri, edgeNormals(tri))
+        )
+
+    def test_pointinpolygon(self):
+        ell = [(0, 0), (10, 0), (10, 2), (2, 2), (2, 10), (0, 10)]
+        self.assertTrue(pointInPolygon((1, 5), ell))
+        self.assertFalse(pointInPolygon((5, 5), ell))
+
+    def test_circletouchespolygon(self):
+        square = [(0, 0), (0, 10), (10, 10), (10, 0)]
+        self.assertTrue(circleTouchesPolygon((5, 5), 1, square))
+        self.assertTrue(circleTouchesPolygon((13, 5), 3, square))
+        self.assertFalse(circleTouchesPolygon((13, 13), 4, square))
+
+    def test_convexhull(self):
+        points = [(0, 0), (10, 0), (5, 2), (10, 10), (5, 5), (0, 10), (5, 0)]
+        hull = convexHull(points)
+        self.assertEqual(set(hull), {(0, 0), (10, 0), (10, 10), (0, 10)})
+        self.assertEqual(len(convexHull([(0, 0), (1, 1), (2, 2)])), 2)
+
+    def test_masks(self):
+        # a 3x3 plus sign
+        plus = [0b010, 0b111, 0b010]
+        self.assertTrue(masksOverlap(plus, 0, 0, plus, 2, 0))
+        self.assertFalse(masksOverlap(plus, 0, 0, plus, 2, 2))
+        self.assertTrue(masksOverlap(plus, 0, 0, plus, -1, 1))
+        self.assertFalse(masksOverlap(plus, 0, 0, plus, -3, 0))
+        self.assertTrue(maskTouchesRect(plus, 10, 10, 12, 11, 20, 11.5))
+        self.assertFalse(maskTouchesRect(plus, 10, 10, 12, 12, 20, 20))
+        self.assertFalse(maskTouchesRect(plus, 10, 10, 0, 0, 10, 20))
+
+    def test_segmententry(self):
+        square = [(0, 0), (0, 10), (10, 10), (10, 0)]
+        self.assertEqual(segmentBoxEntry((-10, 5), (10, 5), 0, 0, 10, 10), 0.5)
+        self.assertEqual(segmentBoxEntry((5, 5), (20, 5), 0, 0, 10, 10), 0.0)
+        self.assertIsNone(segmentBoxEntry((-10, 5), (-1, 5), 0, 0, 10, 10))
+        self.assertIsNone(segmentBoxEntry((-10, 11), (20, 11), 0, 0, 10, 10))
+        self.assertEqual(segmentPolygonEntry((-10, 5), (10, 5), square), 0.5)
+        self.assertEqual(segmentPolygonEntry((20, 5), (0, 5), square), 0.5)
+        self.assertEqual(segmentPolygonEntry((5, 5), (20, 5), square), 0.0)
+        self.assertIsNone(segmentPolygonEntry((-10, 20), (20, 20), [(0, 10), (5, 0)]))
+        self.assertEqual(segmentCircleEntry((-10, 0), (10, 0), (0, 0), 5), 0.25)
+        self.assertEqual(segmentCircleEntry((1, 0), (10, 0), (0, 0), 5), 0.0)
+        self.assertIsNone(segmentCircleEntry((-10, 6), (10, 6), (0, 0), 5))
+        self.assertIsNone(segmentCircleEntry((10, 0), (20, 0), (0, 0), 5))
+
+    def areas(self, triangles):
+        # twice the total area of a list of triangles
+        areas = [
+            (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+            for a, b, c in triangles
+        ]
+        self.assertTrue(all(area > 0 for area in areas))
+        return sum(areas)
+
+    def test_triangulate(self):
+        ell = [(0, 0), (30, 0), (30, 10), (10, 10), (10, 30), (0, 30)]
+        triangles = triangulate(ell)
+        self.assertEqual(len(triangles), 4)
+        self.assertEqual(self.areas(triangles), 2 * 500)
+        self.assertEqual(len(triangulate(ell[::-1])), 4)
+        # collinear points do not produce empty triangles
+        self.assertEqual(
+            self.areas(triangulate([(0, 0), (5, 0), (10, 0), (0, 10)])), 100
+        )
+        self.assertIsNone(triangulate([(0, 0), (10, 10), (10, 0), (0, 10)]))
+
+    def test_convexdecomposition(self):
+        square = [(0, 0), (0, 10), (10, 10), (10, 0)]
+        self.assertEqual(len(convexDecomposition(square)), 1)
+        ell = [(0, 0), (30, 0), (30, 10), (10, 10), (10, 30), (0, 30)]
+        pieces = convexDecomposition(ell)
+        self.assertEqual(len(pieces), 2)
+        self.assertFalse(any(pointInPolygon((20, 20), p) for p in pieces))
+        self.assertTrue(any(pointInPolygon((20, 5), p) for p in pieces))
+        for piece in pieces:
+            self.assertEqual(len(convexHull(piece)), len(piece))
+        star = [(0, -10), (3, -3), (10, 0), (3, 3), (0, 10), (-3, 3), (-10, 0)]
+        star.append((-3, -3))
+        self.assertEqual(len(convexDecomposition(star)), 4)
+        # a polygon that crosses itself falls back to its hull
+        bowtie = [(0, 0), (10, 10), (10, 0), (0, 10)]
+        self.assertEqual(len(convexDecomposition(bowtie)), 1)
+
+    def test_simplifypolygon(self):
+        square = [(0, 0), (5, 0.1), (10, 0), (10, 5), (10, 10), (0, 10), (0, 5)]
+        self.assertEqual(
+            simplifyPolygon(square, 0.5), [(0, 0), (10, 0), (10, 10), (0, 10)]
+        )
+        self.assertEqual(
+            simplifyPolygon(square, 0.05),
+            [(0, 0), (5, 0.1), (10, 0), (10, 10), (0, 10)],
+        )
+        self.assertEqual(simplifyPolygon(square, 0), square)
+        # every removed vertex is close to the simplified outline
+        circle = [
+            (100 * math.cos(i * math.pi / 180), 100 * math.sin(i * math.pi / 180))
+            for i in range(360)
+        ]
+        kept = simplifyPolygon(circle, 1)
+        self.assertLess(len(kept), 40)
+        for p in circle:
+            self.assertTrue(
+                pointInPolygon(p, kept) or circleTouchesPolygon(p, 1.000001, kept)
+            )
+        # at least a triangle remains
+        sliver = [(0, 0), (5, 0.1), (10, 0), (5, -0.1)]
+        self.assertEqual(len(simplifyPolygon(sliver, 1)), 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,7 +9,7 @@ from ggame.input import InputButton, InputNumeric
 from ggame.point import ImagePoint
 from ggame.line import LineSegment
 from ggame.indicator import ImageIndicator
-from ggame import Color, LineStyle, ImageAsset, Frame
+from ggame import Color, LineStyle, ImageAsset, Frame, CircleAsset, Sprite
 from ggame.inputpoint import GlassButton, MetalToggle
 from ggame.indicator import LEDIndicator
 from ggame.timer import Timer
@@ -128,6 +128,89 @@ class TestMathMethods(unittest.TestCase):
         self.Li.destroy()
         self.Lit.destroy()
 
+    def test_hitindex(self):
+        points = [Point((i / 10, 0)) for i in range(100)]
+        for p in points:
+            p.movable = True
+        points[50].selectable = True
+        ma = MathApp()
+        x, y = ma.logicalToPhysical((5, 0))
+        event = type("Event", (), {"x": x + 3, "y": y - 2})
+        ma._handleMouseDown(event)
+        self.assertIs(ma._mouse_captured_object, points[50])
+        self.assertIs(ma._mouse_down_object, points[50])
+        ma._handleMouseUp(event)
+        ma._handleMouseClick(event)
+        self.assertTrue(points[50].selected)
+        # dragging a point refreshes its place in the index
+        ma._handleMouseDown(event)
+        ma._handleMouseMove(event)
+        event.y += 100
+        ma._handleMouseMove(event)
+        ma._handleMouseUp(event)
+        ma._handleMouseDown(event)
+        self.assertIs(ma._mouse_captured_object, points[50])
+        ma._handleMouseUp(event)
+        event.y -= 100
+        ma._handleMouseDown(event)
+        self.assertIsNone(ma._mouse_captured_object)
+        ma._handleMouseUp(event)
+        points[50].destroy()
+        event.y += 100
+        ma._handleMouseDown(event)
+        self.assertIsNone(ma._mouse_captured_object)
+        self.assertIsNone(ma._mouse_down_object)
+        ma._handleMouseUp(event)
+        for p in points:
+            p.destroy()
+        ma.destroy()
+
+    def test_movedhitindex(self):
+        ip = ImagePoint("bunny.png", (0, 0))
+        ip.movable = True
+        ma = MathApp()
+        event = type("Event", (), {"x": 0, "y": 0})
+        ip.setExtents()
+        event.x, event.y = (ip.xmin + ip.xmax) / 2, (ip.ymin + ip.ymax) / 2
+        ma._handleMouseDown(event)
+        self.assertIs(ma._mouse_captured_object, ip)
+        ma._handleMouseUp(event)
+        # moving the sprite directly refreshes its place in the index
+        ip.position = (ip.x + 300, ip.y + 200)
+        ma._handleMouseDown(event)
+        self.assertIsNone(ma._mouse_captured_object)
+        ma._handleMouseUp(event)
+        event.x += 300
+        event.y += 200
+        ma._handleMouseDown(event)
+        self.assertIs(ma._mouse_captured_object, ip)
+        ma._handleMouseUp(event)
+        ip.y -= 200
+        ma._handleMouseDown(event)
+        self.assertIsNone(ma._mouse_captured_object)
+        ma._handleMouseUp(event)
+        ip.destroy()
+        ma.destroy()
+
+    def test_sharedtexture(self):
+        p = Point((0, 0))
+        # the point builds a new asset as it is created, and gives back the
+        # texture of the asset it started with
+        self.assertIsNone(p._sharedtexture)
+        self.assertEqual(p.asset._texturerefs, 0)
+        p.touchAsset(True)
+        p.destroy()
+        self.assertEqual(p.asset._texturerefs, 0)
+        # a plain sprite still releases the texture it acquired
+        asset = CircleAsset(5)
+        s = Sprite(asset)
+        self.assertIs(s._sharedtexture, asset)
+        self.assertEqual(asset._texturerefs, 1)
+        s.destroy()
+        s.destroy()
+        self.assertEqual(asset._texturerefs, 0)
+        asset.destroy()
+
     def timercallback(self, timer):
         self.assertEqual(timer, self.timer)
         self.callbackcomplete = True
@@ -0,0 +1,161 @@
+import unittest
+from ggame.spatial import SpatialHash, SweepAndPrune, QuadTree, AABBTree
+
+
+class Box(object):
+    def __init__(self, xmin, ymin, xmax, ymax):
+        self.xmin = xmin
+        self.ymin = ymin
+        self.xmax = xmax
+        self.ymax = ymax
+        self.refreshed = 0
+
+    def setExtents(self):
+        self.refreshed += 1
+
+
+class TestSpatialHash(unittest.TestCase):
+    def test_insertquery(self):
+        h = SpatialHash(10)
+        a = Box(0, 0, 5, 5)
+        b = Box(25, 25, 45, 45)
+        h.insert(a)
+        h.insert(b)
+        self.assertEqual(len(h), 2)
+        self.assertEqual(h.query(0, 0, 9, 9), {a})
+        self.assertEqual(h.query(30, 30, 31, 31), {b})
+        self.assertEqual(h.query(0, 0, 30, 30), {a, b})
+        self.assertEqual(h.query(100, 100, 200, 200), set())
+
+    def test_moveremove(self):
+        h = SpatialHash(10)
+        a = Box(0, 0, 5, 5)
+        h.insert(a)
+        a.xmin, a.xmax = 100, 105
+        h.move(a)
+        self.assertEqual(h.query(0, 0, 9, 9), set())
+        self.assertEqual(h.query(100, 0, 101, 1), {a})
+        h.remove(a)
+        self.assertNotIn(a, h)
+        self.assertEqual(h.query(100, 0, 101, 1), set())
+        # moving an absent object does not insert it
+        h.move(a)
+        self.assertEqual(len(h), 0)
+
+    def test_invalidate(self):
+        h = SpatialHash(10)
+        a = Box(0, 0, 5, 5)
+        h.insert(a)
+        a.xmin, a.xmax = -20, -15
+        h.invalidate(a)
+        self.assertEqual(h.query(-20, 0, -19, 1), {a})
+        self.assertEqual(a.refreshed, 1)
+        self.assertEqual(h.query(0, 0, 9, 9), set())
+
+    def test_querysegment(self):
+        h = SpatialHash(10)
+        a = Box(0, 0, 5, 5)
+        b = Box(30, 30, 35, 35)
+        c = Box(30, 0, 35, 5)
+        for box in (a, b, c):
+            h.insert(box)
+        self.assertEqual(h.querySegment(1, 1, 34, 34), {a, b})
+        self.assertEqual(h.querySegment(34, 34, 1, 1), {a, b})
+        self.assertEqual(h.querySegment(1, 2, 34, 2), {a, c})
+        self.assertEqual(h.querySegment(32, 40, 32, -5), {b, c})
+        self.assertEqual(h.querySegment(15, 15, 16, 16), set())
+
+
+class TestQuadTree(unittest.TestCase):
+    def test_insertquery(self):
+        t = QuadTree(capacity=2)
+        boxes = [Box(i * 3, i * 3, i * 3 + 2, i * 3 + 2) for i in range(50)]
+        for box in boxes:
+            t.insert(box)
+        far = Box(-5000, 9000, -4990, 9010)
+        t.insert(far)
+        self.assertEqual(len(t), 51)
+        self.assertEqual(t.query(4, 4, 4, 4), [boxes[1]])
+        self.assertEqual(t.query(0, 0, 7, 7), boxes[:3])
+        self.assertEqual(t.query(-4995, 9005, -4995, 9005), [far])
+        self.assertEqual(t.query(1000, 0, 2000, 100), [])
+        self.assertEqual(t.query(-1e5, -1e5, 1e5, 1e5), boxes + [far])
+        with self.assertRaises(ValueError):
+            t.insert(Box(0, 0, float("nan"), 1))
+
+    def test_moveinvalidate(self):
+        t = QuadTree(capacity=1)
+        a = Box(0, 0, 5, 5)
+        b = Box(10, 10, 15, 15)
+        t.insert(a)
+        t.insert(b)
+        a.xmin, a.xmax = 100, 105
+        self.assertEqual(t.query(0, 0, 5, 5), [a])
+        t.invalidate(a)
+        self.assertEqual(t.query(0, 0, 5, 5), [])
+        # results keep the order of insertion after a move
+        self.assertEqual(t.query(0, 0, 200, 200), [a, b])
+        t.remove(a)
+        self.assertNotIn(a, t)
+        t.move(a)
+        self.assertEqual(t.query(0, 0, 200, 200), [b])
+
+    def test_extentsfunction(self):
+        t = QuadTree(lambda obj: (obj[0] - 1, obj[1] - 1, obj[0] + 1, obj[1] + 1))
+        t.insert((10, 10))
+        self.assertEqual(t.query(11, 9, 11, 9), [(10, 10)])
+        self.assertEqual(t.query(12, 12, 13, 13), [])
+
+
+class TestSweepAndPrune(unittest.TestCase):
+    def test_pairs(self):
+        sap = SweepAndPrune()
+        a = Box(0, 0, 10, 10)
+        b = Box(5, 5, 15, 15)
+        c = Box(12, 30, 20, 40)
+        d = Box(14, 14, 16, 16)
+        for box in (a, b, c, d):
+            sap.insert(box)
+        found = {frozenset(p) for p in sap.pairs()}
+        self.assertEqual(found, {frozenset((a, b)), frozenset((b, d))})
+        # move and re-sweep
+        c.ymin, c.ymax = 0, 10
+        found = {frozenset(p) for p in sap.pairs()}
+        self.assertEqual(
+            found, {frozenset((a, b)), frozenset((b, d)), frozenset((b, c))}
+        )
+        sap.remove(b)
+        self.assertEqual(len(sap), 3)
+        self.assertEqual(sap.pairs(), [])
+        # an object removed and added again between sweeps is listed once
+        sap.remove(a)
+        sap.insert(a)
+        sap.insert(b)
+        self.assertEqual(len(sap.pairs()), 3)
+
+
+class TestAABBTree(unittest.TestCase):
+    def test_query(self):
+        boxes = [Box(x, y, x + 8, y + 8) for x in range(0, 100, 10) for y in (0, 50)]
+        t = AABBTree(boxes)
+        self.assertEqual(len(t), 20)
+        self.assertIn(boxes[0], t)
+        self.assertTrue(all(box.refreshed == 1 for box in boxes))
+        self.assertEqual(t.query(1, 1, 2, 2), [boxes[0]])
+        self.assertEqual(set(t.query(5, 5, 15, 15)), {boxes[0], boxes[2]})
+        self.assertEqual(len(t.query(-10, -10, 200, 200)), 20)
+        self.assertEqual(t.query(0, 20, 100, 40), [])
+        self.assertEqual(t.query(200, 200, 300, 300), [])
+        self.assertEqual(AABBTree().query(0, 0, 10, 10), [])
+
+    def test_querysegment(self):
+        boxes = [Box(x, y, x + 8, y + 8) for x in range(0, 100, 10) for y in (0, 50)]
+        t = AABBTree(boxes)
+        self.assertEqual(set(t.querySegment(-5, 4, 25, 4)), set(boxes[0:6:2]))
+        self.assertEqual(set(t.querySegment(4, -5, 4, 100)), set(boxes[:2]))
+        self.assertEqual(t.querySegment(0, 20, 100, 20), [])
+        self.assertEqual(t.querySegment(9, 0, 9, 100), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,10 @@
+import math
 import unittest
 from ggame import ImageAsset, Frame, Color, LineStyle, RectangleAsset
 from ggame import CircleAsset, EllipseAsset, PolygonAsset, LineAsset, TextAsset
-from ggame import App, Sprite
+from ggame import CircleGroupAsset
+from ggame import App, Sprite, SpritePool, CollisionEvent
+from ggame.sprite import _PAIRCACHESIZE
 
 
 class TestSpriteMethods(unittest.TestCase):
@@ -96,6 +99,28 @@ class TestSpriteMethods(unittest.TestCase):
         s2.destroy()
         s3.destroy()
 
+    def test_spritesbyclass(self):
+        class Enemy(Sprite):
+            pass
+
+        class FastEnemy(Enemy):
+            pass
+
+        s1 = Sprite(self.image)
+        e1 = Enemy(self.image)
+        e2 = FastEnemy(self.image)
+        self.assertEqual(App.getSpritesbyClass(Enemy), (e1, e2))
+        self.assertEqual(App.getSpritesbyClass(FastEnemy), (e2,))
+        self.assertEqual(App.getSpritesbyClass(Sprite)[-3:], (s1, e1, e2))
+        # repeated queries share one read-only sequence
+        self.assertIs(App.getSpritesbyClass(Enemy), App.getSpritesbyClass(Enemy))
+        e2.destroy()
+        self.assertEqual(App.getSpritesbyClass(Enemy), (e1,))
+        self.assertEqual(App.getSpritesbyClass(FastEnemy), ())
+        self.assertEqual(s1.collidingWithSprites(Enemy), [e1])
+        s1.destroy()
+        e1.destroy()
+
     def test_enfoldingcollision(self):
         def step():
             s1.x += 1
@@ -131,8 +156,9 @@ class TestSpriteMethods(unittest.TestCase):
         s1.x = 172
         c = s1.collidingWith(s2)
         self.assertFalse(c, msg="circle not colliding with rect on right side")
-        # Now scale at 2x
+        # Now scale at 2x, keeping the circle center level with the rect center
         s1.scale = 2
+        s1.y = 50
         s1.x = 40
         c = s1.collidingWith(s2)
         self.assertFalse(c, msg="2x scaled circle not colliding with rect")
@@ -151,6 +177,572 @@ class TestSpriteMethods(unittest.TestCase):
         s1.destroy()
         s2.destroy()
 
+    def test_spatialhashcollision(self):
+        class SpriteChild(Sprite):
+            pass
+
+        App.enableSpatialHash(32)
+        s1 = Sprite(self.image, (51, 52))
+        s2 = Sprite(self.image, (61, 52))
+        s3 = SpriteChild(self.image, (71, 52))
+        s4 = Sprite(self.image, (500, 500))
+        self.assertEqual(len(s1.collidingWithSprites()), 2)
+        self.assertEqual(s1.collidingWithSprites(SpriteChild), [s3])
+        self.assertEqual(s4.collidingWithSprites(), [])
+        # moving updates the grid
+        s4.position = (60, 60)
+        self.assertEqual(len(s4.collidingWithSprites()), 3)
+        # center, rotation and scale changes are picked up before the next query
+        s4.x = 150
+        self.assertEqual(s4.collidingWithSprites(), [])
+        s4.fxcenter = 1.0
+        self.assertEqual(len(s4.collidingWithSprites()), 3)
+        s3.destroy()
+        self.assertEqual(s1.collidingWithSprites(SpriteChild), [])
+        App.disableSpatialHash()
+        self.assertEqual(len(s1.collidingWithSprites()), 2)
+        s1.destroy()
+        s2.destroy()
+        s4.destroy()
+
+    def test_collisionpairs(self):
+        class SpriteChild(Sprite):
+            pass
+
+        s1 = Sprite(self.image, (51, 52))
+        s2 = Sprite(self.image, (61, 52))
+        s3 = SpriteChild(self.image, (71, 52))
+        s4 = SpriteChild(self.image, (500, 500))
+        pairs = App.collisionPairs()
+        self.assertEqual(len(pairs), 3)
+        self.assertEqual(
+            {frozenset(p) for p in pairs},
+            {frozenset((s1, s2)), frozenset((s1, s3)), frozenset((s2, s3))},
+        )
+        pairs = App.collisionPairs(SpriteChild, Sprite)
+        self.assertEqual(len(pairs), 2)
+        for a, b in pairs:
+            self.assertIs(a, s3)
+            self.assertIs(type(b), Sprite)
+        # sorted order is maintained as sprites move and are removed
+        s4.position = (80, 60)
+        s1.x = 700
+        pairs = App.collisionPairs(SpriteChild, SpriteChild)
+        self.assertEqual({frozenset(p) for p in pairs}, {frozenset((s3, s4))})
+        s3.destroy()
+        self.assertEqual(App.collisionPairs(Sprite, SpriteChild), [(s2, s4)])
+        s1.destroy()
+        s2.destroy()
+        s4.destroy()
+
+    def test_polygoncollision(self):
+        tri = PolygonAsset([(0, 0), (40, 0), (0, 40), (0, 0)])
+        s1 = Sprite(tri, (0, 0))
+        s2 = Sprite(self.rect, (25, 25))
+        # bounding boxes overlap but the hypotenuse separates them
+        self.assertFalse(s1.collidingWith(s2))
+        self.assertFalse(s2.collidingWith(s1))
+        s2.position = (15, 15)
+        self.assertTrue(s1.collidingWith(s2))
+        # moved vertices are used after a pure translation
+        s1.x = -30
+        self.assertFalse(s1.collidingWith(s2))
+        # rotated rectangle
+        s3 = Sprite(RectangleAsset(40, 4), (100, 100))
+        s4 = Sprite(RectangleAsset(4, 4), (130, 80))
+        self.assertFalse(s3.collidingWith(s4))
+        s3.rotation = 0.6
+        self.assertTrue(s3.collidingWith(s4))
+        s1.destroy()
+        s2.destroy()
+        s3.destroy()
+        s4.destroy()
+
+    def test_circlepolycollision(self):
+        s1 = Sprite(self.circ, (0, 0))
+        s2 = Sprite(self.rect, (55, 55))
+        # the corner of the rectangle is just outside the circle
+        self.assertFalse(s1.collidingWith(s2))
+        self.assertFalse(s2.collidingWith(s1))
+        s2.position = (50, 50)
+        self.assertTrue(s1.collidingWith(s2))
+        self.assertTrue(s2.collidingWith(s1))
+        s1.destroy()
+        s2.destroy()
+
+    def test_translatedvertices(self):
+        s = Sprite(self.rect, (100, 100))
+        s.rotation = 0.5
+        before = s._absolutevertices
+        local = s._localvertices
+        s.x += 10
+        s.y -= 5
+        after = s._absolutevertices
+        for (x0, y0), (x1, y1) in zip(before, after):
+            self.assertAlmostEqual(x1, x0 + 10)
+            self.assertAlmostEqual(y1, y0 - 5)
+        # the rotated shape was reused rather than recomputed
+        self.assertIs(s._localvertices, local)
+        s.rotation = 0.6
+        s.setExtents()
+        self.assertIsNot(s._localvertices, local)
+        s.destroy()
+
+    def test_destroylater(self):
+        def step():
+            for s in App.getSpritesbyClass(Sprite):
+                if s.collidingWith(s2):
+                    s.destroyLater()
+            frames.append(len(App.spritelist))
+
+        frames = []
+        s1 = Sprite(self.image, (51, 52))
+        s2 = Sprite(self.image, (61, 52))
+        s3 = Sprite(self.image, (71, 52))
+        count = len(App.spritelist)
+        a = App()
+        a.userfunc = step
+        a._animate(1)
+        a._animate(1)
+        # s1 and s3 are destroyed at the end of the first frame only
+        self.assertEqual(frames[0], count)
+        self.assertEqual(frames[-1], count - 2)
+        self.assertNotIn(s1, App.spritelist)
+        self.assertNotIn(s3, App.spritelist)
+        self.assertIn(s2, App.spritelist)
+        self.assertFalse(s1.collidingWith(s2))
+        s2.destroy()
+
+    def test_spritepool(self):
+        pool = SpritePool(self.rect, 3)
+        self.assertEqual(pool.available, 3)
+        target = Sprite(self.rect, (100, 100))
+        self.assertEqual(target.collidingWithSprites(), [])
+        b1 = pool.acquire((105, 105))
+        gfx = b1.gfx
+        self.assertTrue(b1.visible)
+        self.assertIn(b1, App.spritelist)
+        self.assertEqual(target.collidingWithSprites(), [b1])
+        self.assertEqual(pool.active, (b1,))
+        pool.release(b1)
+        self.assertFalse(b1.visible)
+        self.assertNotIn(b1, App.spritelist)
+        self.assertEqual(target.collidingWithSprites(), [])
+        # sprites and their graphics objects are reused
+        b2 = pool.acquire((0, 0))
+        self.assertIs(b2, b1)
+        self.assertIs(b2.gfx, gfx)
+        self.assertEqual(b2.position, (0, 0))
+        # the pool grows on demand
+        more = [pool.acquire() for i in range(4)]
+        self.assertEqual(pool.available, 0)
+        self.assertEqual(len(pool.active), 5)
+        for b in more:
+            pool.release(b)
+        self.assertEqual(pool.available, 4)
+        pool.destroy()
+        self.assertNotIn(b2, App.spritelist)
+        target.destroy()
+
+    def test_spritepooldestroy(self):
+        pool = SpritePool(self.rect, 2)
+        a = App()
+        a.userfunc = lambda: None
+        b1 = pool.acquire((10, 10))
+        b2 = pool.acquire((20, 20))
+        # releasing a sprite cancels its pending destruction
+        b1.destroyLater()
+        pool.release(b1)
+        # a sprite destroyed at the end of the frame leaves the pool
+        b2.destroyLater()
+        a._animate(1)
+        self.assertEqual(pool.active, ())
+        self.assertEqual(pool.available, 1)
+        self.assertIs(pool.acquire((30, 30)), b1)
+        self.assertIn(b1, App.spritelist)
+        pool.release(b1)
+        # so does a sprite destroyed while it is parked
+        b1.destroy()
+        self.assertEqual(pool.available, 0)
+        b3 = pool.acquire()
+        self.assertIsNot(b3, b1)
+        self.assertIsNot(b3, b2)
+        pool.destroy()
+        self.assertNotIn(b3, App.spritelist)
+
+    def test_sharedtexture(self):
+        asset = CircleAsset(5)
+        sprites = [Sprite(asset, (i, i)) for i in range(10)]
+        texture = sprites[0].gfx.texture
+        for s in sprites:
+            self.assertIs(s.gfx.texture, texture)
+        self.assertEqual(asset._texturerefs, 10)
+        # the texture outlives the asset until the last sprite is gone
+        asset.destroy()
+        self.assertIs(asset._texture, texture)
+        for s in sprites:
+            s.destroy()
+        self.assertEqual(asset._texturerefs, 0)
+        self.assertIsNone(asset._texture)
+        # destroying a sprite twice releases its texture only once
+        asset = RectangleAsset(5, 5)
+        s1 = Sprite(asset)
+        s2 = Sprite(asset)
+        s1.destroy()
+        s1.destroy()
+        self.assertEqual(asset._texturerefs, 1)
+        s2.destroy()
+        asset.destroy()
+        self.assertIsNone(asset._texture)
+
+    def test_sharedvertices(self):
+        arrow = PolygonAsset([(10, 10), (30, 20), (10, 30), (15, 20)])
+        s1 = Sprite(arrow)
+        s2 = Sprite(arrow, (50, 50))
+        self.assertIs(s1._basevertices, s2._basevertices)
+        # the concave notch is left out of the collision hull
+        self.assertEqual(set(s1._basevertices), {(0, 0), (20, 10), (0, 20)})
+        self.assertEqual((s1.xmax, s1.ymax), (20, 20))
+        s1.destroy()
+        s2.destroy()
+
+    def test_concave(self):
+        ell = PolygonAsset([(0, 0), (30, 0), (30, 10), (10, 10), (10, 30), (0, 30)])
+        self.assertEqual(len(ell._convexpieces), 2)
+        wall = Sprite(ell, (100, 100))
+        box = Sprite(RectangleAsset(5, 5), (120, 120))
+        ball = Sprite(CircleAsset(3), (120, 120))
+        # inside the convex hull, but in the notch of the L
+        self.assertFalse(wall.collidingWith(box))
+        self.assertFalse(wall.collidingWith(ball))
+        box.y = ball.y = 105
+        self.assertTrue(wall.collidingWith(box))
+        self.assertTrue(ball.collidingWith(wall))
+        self.assertAlmostEqual(wall.segmentEntry((120, 140), (120, 90)), 0.6)
+        self.assertIsNone(wall.segmentEntry((120, 140), (140, 120)))
+        # pieces follow the sprite's transform
+        wall.rotation = math.pi
+        box.position = (80, 80)
+        self.assertFalse(wall.collidingWith(box))
+        box.position = (80, 92)
+        self.assertTrue(wall.collidingWith(box))
+        for s in (wall, box, ball):
+            s.destroy()
+
+    def test_circlegroup(self):
+        # a dumbbell: two circles joined across a gap
+        body = CircleGroupAsset([((5, 5), 5), ((35, 5), 5)])
+        self.assertEqual(len(body._basevertices), 8)
+        a = Sprite(RectangleAsset(40, 10), (100, 100), body)
+        self.assertEqual((a.xmin, a.ymin, a.xmax, a.ymax), (100, 100, 140, 110))
+        ball = Sprite(CircleAsset(2), (118, 103))
+        box = Sprite(RectangleAsset(4, 4), (118, 103))
+        other = Sprite(RectangleAsset(40, 10), (100, 100), body)
+        # between the two circles
+        self.assertFalse(a.collidingWith(ball))
+        self.assertFalse(box.collidingWith(a))
+        ball.x = box.x = 108
+        self.assertTrue(a.collidingWith(ball))
+        self.assertTrue(box.collidingWith(a))
+        self.assertTrue(a.collidingWith(other))
+        other.position = (100, 111)
+        self.assertFalse(a.collidingWith(other))
+        self.assertAlmostEqual(a.segmentEntry((120, 105), (150, 105)), 10 / 30)
+        # the circles turn and scale with the sprite
+        a.rotation = math.pi / 2
+        a.scale = 2
+        a.setExtents()
+        self.assertEqual(round(a.ymin), 100 - 80)
+        ball.position = (108, 30)
+        self.assertTrue(a.collidingWith(ball))
+        ball.position = (108, 60)
+        self.assertFalse(a.collidingWith(ball))
+        for s in (a, ball, box, other):
+            s.destroy()
+
+    def test_compactsprite(self):
+        s1 = Sprite(self.rect, (10, 10))
+        s2 = Sprite(self.rect, (20, 20))
+        # sprites with the same shape and transform share collision data
+        s1.setExtents()
+        s2.setExtents()
+        self.assertIs(s1._localvertices, s2._localvertices)
+        self.assertFalse(hasattr(s1.gfx, "__dict__"))
+        self.assertFalse(hasattr(s1.gfx.position, "__dict__"))
+        # ad hoc attributes are still allowed
+        s1.vx = 5
+        self.assertEqual(s1.vx, 5)
+        self.assertEqual(s2._absolutevertices[0], (20, 20))
+        s1.destroy()
+        s2.destroy()
+
+    def test_pixelmask(self):
+        image = ImageAsset("bunny.png", pixelmask=True)
+        b1 = Sprite(image, (0, 0))
+        # only the transparent corners of the two images overlap
+        b2 = Sprite(image, (65, 95))
+        self.assertFalse(b1.collidingWith(b2))
+        p1 = Sprite(self.image, (0, 0))
+        p2 = Sprite(self.image, (65, 95))
+        self.assertTrue(p1.collidingWith(p2))
+        b2.position = (20, 90)
+        self.assertTrue(b1.collidingWith(b2))
+        r = Sprite(RectangleAsset(4, 4), (66, 96))
+        self.assertFalse(r.collidingWith(b1))
+        r.position = (30, 50)
+        self.assertTrue(r.collidingWith(b1))
+        # rotated sprites fall back to the rectangle
+        b1.rotation = 0.01
+        self.assertIsNone(b1._pixelMask())
+        for s in (b1, b2, p1, p2, r):
+            s.destroy()
+
+    def test_segmentquery(self):
+        class Wall(Sprite):
+            pass
+
+        near = Wall(self.rect, (50, 0))
+        far = Sprite(CircleAsset(10), (100, 0))
+        rotated = Sprite(self.rect, (150, 0))
+        rotated.rotation = math.pi / 2
+        for spatialhash in (False, True):
+            if spatialhash:
+                App.enableSpatialHash(32)
+            hits = App.segmentQuery((0, 10), (200, 10))
+            self.assertEqual(hits[-2:], [(near, 50), (far, 100)])
+            self.assertEqual(App.segmentQuery((0, 5), (55, 5), Wall), [(near, 50)])
+            self.assertEqual(App.segmentQuery((0, 50), (200, 50)), [])
+            # the rotated rectangle lies to the right of and above its position
+            self.assertEqual(App.segmentQuery((160, -5), (160, 50)), [(rotated, 0)])
+            hits = App.raycast((200, -5), (-2, 0), 100)
+            self.assertEqual(hits, [(rotated, 30)])
+            hits = App.raycast((200, 10), (-2, 0), 200)
+            self.assertEqual(hits[:2], [(far, 80), (near, 140)])
+            self.assertEqual(App.raycast((0, 5), (1, 0), 20), [])
+        App.disableSpatialHash()
+        with self.assertRaises(ValueError):
+            App.raycast((0, 0), (0, 0), 10)
+        for s in (near, far, rotated):
+            s.destroy()
+
+    def test_continuous(self):
+        def step():
+            bullet.x += 100
+            ball.x += 100
+            hits.append(bullet.collidingWithSprites())
+            pairs.append(App.collisionPairs())
+
+        hits = []
+        pairs = []
+        wall = Sprite(RectangleAsset(2, 100), (150, 0))
+        bullet = Sprite(RectangleAsset(4, 4), (100, 50))
+        ball = Sprite(CircleAsset(5), (100, 200))
+        target = Sprite(CircleAsset(5), (160, 206))
+        a = App()
+        a.userfunc = step
+        a._animate(1)
+        # without continuous mode the bullet skips over the wall
+        self.assertEqual(hits[-1], [])
+        self.assertEqual(pairs[-1], [])
+        bullet.continuous = ball.continuous = True
+        bullet.x = ball.x = 100
+        a._animate(1)
+        self.assertEqual(hits[-1], [wall])
+        self.assertEqual(len(pairs[-1]), 2)
+        self.assertEqual(
+            set(map(frozenset, pairs[-1])),
+            {frozenset((bullet, wall)), frozenset((ball, target))},
+        )
+        # time of impact as a fraction of the frame's motion
+        self.assertAlmostEqual(bullet.timeOfImpact(wall), 0.46)
+        self.assertAlmostEqual(wall.timeOfImpact(bullet), 0.46)
+        # circles are swept as circles, not as boxes
+        self.assertAlmostEqual(ball.timeOfImpact(target), 0.52)
+        # no motion during the next frame
+        a.userfunc = lambda: None
+        a._animate(1)
+        self.assertFalse(bullet.collidingWith(wall))
+        self.assertIsNone(bullet.timeOfImpact(wall))
+        for s in (wall, bullet, ball, target):
+            s.destroy()
+
+    def test_collisionlayers(self):
+        player = Sprite(self.rect, (0, 0))
+        enemy = Sprite(self.rect, (5, 5))
+        bullet = Sprite(self.rect, (2, 2))
+        self.assertEqual(bullet.collidingWithSprites(), [player, enemy])
+        player.collisionlayer = 1
+        enemy.collisionlayer = 2
+        bullet.collisionlayer = 4
+        bullet.collisionmask = 2
+        self.assertEqual(bullet.collidingWithSprites(), [enemy])
+        self.assertFalse(player.collidingWith(bullet))
+        # both sprites must accept each other
+        enemy.collisionmask = 1
+        self.assertEqual(bullet.collidingWithSprites(), [])
+        self.assertEqual(App.getSpritesbyLayer(2), (enemy,))
+        self.assertEqual(set(App.getSpritesbyLayer(6)), {enemy, bullet})
+        enemy.collisionlayer = 8
+        self.assertEqual(App.getSpritesbyLayer(2), ())
+        self.assertEqual(App.getSpritesbyLayer(8), (enemy,))
+        with self.assertRaises(ValueError):
+            enemy.collisionlayer = -1
+        # sprites with the default layer and mask skip the layer test
+        other = Sprite(self.rect, (0, 0))
+        player.collisionmask = 2
+        self.assertFalse(other.collidingWith(player))
+        player.collisionmask = -1
+        self.assertTrue(player._defaultlayers)
+        self.assertTrue(other.collidingWith(player))
+        other.destroy()
+        App.enableSpatialHash()
+        enemy.collisionmask = 4
+        bullet.collisionmask = 8
+        self.assertEqual(bullet.collidingWithSprites(), [enemy])
+        pairs = [set(pair) for pair in App.collisionPairs()]
+        self.assertIn({enemy, bullet}, pairs)
+        self.assertNotIn({player, bullet}, pairs)
+        App.disableSpatialHash()
+        for s in (player, enemy, bullet):
+            s.destroy()
+        self.assertEqual(App.getSpritesbyLayer(8), ())
+
+    def test_static(self):
+        walls = [Sprite(self.rect, (x, 100)) for x in range(0, 1000, 10)]
+        for wall in walls:
+            wall.static = True
+        player = Sprite(self.rect, (45, 95))
+        self.assertEqual(player.collidingWithSprites(), walls[4:6])
+        self.assertEqual(walls[4].collidingWithSprites(), [player])
+        # static sprites are never paired with each other
+        self.assertEqual(walls[4].collidingWithSprites(Sprite), [player])
+        pairs = [set(pair) for pair in App.collisionPairs()]
+        self.assertIn({player, walls[4]}, pairs)
+        self.assertIn({player, walls[5]}, pairs)
+        self.assertFalse(any(pair <= set(walls) for pair in pairs))
+        hits = App.segmentQuery((0, 118), (100, 118))
+        self.assertEqual([s for s, _ in hits], walls[:11])
+        App.enableSpatialHash(32)
+        self.assertEqual(set(player.collidingWithSprites()), set(walls[4:6]))
+        # moving a static sprite rebuilds the tree
+        walls[20].position = (50, 90)
+        self.assertEqual(
+            set(player.collidingWithSprites()), {walls[4], walls[5], walls[20]}
+        )
+        walls[20].static = False
+        self.assertIn(walls[20], walls[4].collidingWithSprites())
+        App.disableSpatialHash()
+        walls[20].destroy()
+        self.assertEqual(player.collidingWithSprites(), walls[4:6])
+        for s in walls + [player]:
+            s.destroy()
+
+    def test_collisionevents(self):
+        class Player(Sprite):
+            def onCollisionEnter(self, event):
+                log.append(("player enter", event.other))
+
+            def onCollisionExit(self, event):
+                log.append(("player exit", event.other))
+
+        def listener(event):
+            log.append((event.type, {event.sprite, event.other}))
+
+        log = []
+        player = Player(self.rect, (0, 0))
+        wall = Sprite(self.rect, (5, 100))
+        a = App()
+        a.userfunc = lambda: None
+        App.listenCollisionEvent(CollisionEvent.collisionenter, listener)
+        App.listenCollisionEvent(CollisionEvent.collisionstay, listener)
+        App.listenCollisionEvent(CollisionEvent.collisionexit, listener)
+        a._animate(1)
+        self.assertEqual(log, [])
+        player.y = 90
+        a._animate(1)
+        self.assertEqual(
+            log, [("collisionenter", {player, wall}), ("player enter", wall)]
+        )
+        del log[:]
+        a._animate(1)
+        self.assertEqual(log, [("collisionstay", {player, wall})])
+        del log[:]
+        App.unlistenCollisionEvent(CollisionEvent.collisionstay, listener)
+        a._animate(1)
+        self.assertEqual(log, [])
+        player.y = 0
+        a._animate(1)
+        self.assertEqual(
+            log, [("collisionexit", {player, wall}), ("player exit", wall)]
+        )
+        App.unlistenCollisionEvent(CollisionEvent.collisionenter, listener)
+        App.unlistenCollisionEvent(CollisionEvent.collisionexit, listener)
+        player.destroy()
+        wall.destroy()
+
+    def test_handlercontacts(self):
+        class Player(Sprite):
+            def onCollisionEnter(self, event):
+                log.append(event.other)
+
+        log = []
+        player = Player(self.rect, (0, 0))
+        wall = Sprite(self.rect, (5, 10))
+        rocks = [Sprite(self.rect, (200, 200)), Sprite(self.rect, (205, 205))]
+        a = App()
+        a.userfunc = lambda: None
+        a._animate(1)
+        self.assertEqual(log, [wall])
+        # without a listener, contacts between other sprites are not tracked
+        self.assertEqual(list(App._contacts), [tuple(sorted((player, wall), key=id))])
+        for s in [player, wall] + rocks:
+            s.destroy()
+
+    def test_paircache(self):
+        class Counted(Sprite):
+            def _overlappingShapes(self, obj):
+                tests.append(self)
+                return super()._overlappingShapes(obj)
+
+        tests = []
+        s1 = Counted(self.rect, (0, 0))
+        s2 = Counted(self.rect, (5, 5))
+        a = App()
+        a.userfunc = lambda: None
+        self.assertTrue(s1.collidingWith(s2))
+        self.assertTrue(s2.collidingWith(s1))
+        self.assertEqual(len(tests), 1)
+        # moving, turning or scaling either sprite forgets the result
+        s2.x = 50
+        self.assertFalse(s1.collidingWith(s2))
+        s2.x = 5
+        s1.rotation = math.pi
+        self.assertFalse(s2.collidingWith(s1))
+        s1.rotation = 0
+        s1.scale = 2
+        self.assertTrue(s2.collidingWith(s1))
+        # only pairs with overlapping extents are tested carefully
+        self.assertEqual(len(tests), 2)
+        self.assertTrue(s1.collidingWith(s2))
+        self.assertEqual(len(tests), 2)
+        # so does the next frame
+        a._animate(1)
+        self.assertTrue(s1.collidingWith(s2))
+        self.assertEqual(len(tests), 3)
+        # results are forgotten rather than piling up outside the frame loop
+        pile = [Sprite(self.rect, (0, 0)) for _ in range(150)]
+        for s in pile:
+            s.collidingWithSprites()
+        self.assertGreater(150 * 149 // 2, _PAIRCACHESIZE)
+        self.assertLessEqual(len(App._pairresults), _PAIRCACHESIZE)
+        # and are kept by sprite id, so destroyed sprites are not kept alive
+        for pair in App._pairresults:
+            self.assertEqual([type(i) for i in pair], [int, int])
+        for s in pile:
+            s.destroy()
+        s1.destroy()
+        s2.destroy()
+
 
 if __name__ == "__main__":
     unittest.main()
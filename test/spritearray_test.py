@@ -0,0 +1,88 @@
+import math
+import unittest
+from ggame import App, Sprite, RectangleAsset, CircleAsset, ImageAsset
+from ggame.spritearray import SpriteArray, np
+
+
+@unittest.skipUnless(np, "numpy is not installed")
+class TestSpriteArray(unittest.TestCase):
+    def assertSameExtents(self, arr, sprites):
+        for i, s in enumerate(sprites):
+            s._extentsdirty = True
+            s.setExtents()
+            self.assertAlmostEqual(arr.xmin[i], s.xmin)
+            self.assertAlmostEqual(arr.xmax[i], s.xmax)
+            self.assertAlmostEqual(arr.ymin[i], s.ymin)
+            self.assertAlmostEqual(arr.ymax[i], s.ymax)
+
+    def test_bulkmove(self):
+        a = App()
+        arr = SpriteArray(RectangleAsset(10, 20), [(i * 30, 0) for i in range(20)])
+        self.assertEqual(len(arr), 20)
+        arr.x += 5
+        arr.y += np.arange(20)
+        arr.sync()
+        self.assertEqual(arr[3].position, (95, 3))
+        self.assertEqual((arr[3].xmin, arr[3].ymax), (95, 23))
+        self.assertEqual(arr[3].collidingWithSprites(), [])
+        with self.assertRaises(AttributeError):
+            arr.xmin = 0
+        arr.destroy()
+        self.assertEqual(len(arr), 0)
+        a.destroy()
+
+    def test_extents(self):
+        a = App()
+        for asset in (RectangleAsset(10, 20), ImageAsset("bunny.png")):
+            arr = SpriteArray(asset, [(i, i) for i in range(5)])
+            arr.rotation = np.linspace(0, math.pi, 5)
+            arr.fxcenter = 0.5
+            arr.fycenter = np.linspace(0, 1, 5)
+            arr.sync()
+            # unsynced sprites compute their own extents from scratch
+            self.assertSameExtents(arr, list(arr))
+            arr.destroy()
+        arr = SpriteArray(CircleAsset(10), [(i, i) for i in range(5)])
+        arr.rotation = np.linspace(0, math.pi, 5)
+        arr.scale = np.linspace(1, 3, 5)
+        arr.fxcenter = arr.fycenter = 0.25
+        arr.sync()
+        self.assertSameExtents(arr, list(arr))
+        arr.destroy()
+        a.destroy()
+
+    def test_collision(self):
+        a = App()
+        a.enableSpatialHash(32)
+        arr = SpriteArray(RectangleAsset(10, 10), [(0, 0), (100, 0)])
+        target = Sprite(RectangleAsset(10, 10), (200, 0))
+        arr.x += 95
+        arr.sync()
+        self.assertEqual(target.collidingWithSprites(), [arr[1]])
+        # a rotated square no longer reaches the target
+        arr.rotation = math.pi / 4
+        arr.x[1] = 200 - 10 * math.sqrt(2) - 1
+        arr.sync()
+        self.assertFalse(target.collidingWith(arr[1]))
+        arr.x[1] += 2
+        arr.sync()
+        self.assertTrue(target.collidingWith(arr[1]))
+        arr.append((205, 5))
+        arr.sync()
+        self.assertEqual(len(target.collidingWithSprites()), 2)
+        arr.destroy()
+        target.destroy()
+        a.destroy()
+
+    def test_static(self):
+        arr = SpriteArray(RectangleAsset(10, 10), [(0, 0), (100, 0)])
+        target = Sprite(RectangleAsset(10, 10), (200, 0))
+        for s in arr:
+            s.static = True
+        self.assertEqual(target.collidingWithSprites(), [])
+        # the static tree follows sprites moved by the array
+        arr.x += 95
+        arr.sync()
+        self.assertEqual(target.collidingWithSprites(), [arr[1]])
+        arr.destroy()
+        target.destroy()